@@ -1,5 +1,7 @@
+from .async_google_hook import AsyncGoogleSheetsHook
 from .google_hook import GoogleSheetsHook
 from .jinja_hook import JinjaHook
 from .snowflake_hook import SnowflakeHook
+from .sqlite_hook import SQLiteHook
 
-__all__ = ["SnowflakeHook", "JinjaHook", "GoogleSheetsHook"]
+__all__ = ["SnowflakeHook", "SQLiteHook", "JinjaHook", "GoogleSheetsHook", "AsyncGoogleSheetsHook"]
@@ -0,0 +1,395 @@
+import asyncio
+import copy
+import json
+import logging
+import os
+from typing import Any, Optional, Union
+from urllib.parse import quote
+
+import aiohttp
+import pandas as pd
+from google.auth.transport.requests import Request
+from google.oauth2.service_account import Credentials
+from gspread.utils import absolute_range_name, fill_gaps
+from yarl import URL
+
+from ..utils.gsheets import adapt_data_for_gsheets, grid_to_frame, render_options, split_blocks
+from ..utils.rate_limit import RateLimiter
+from .base import BaseHook
+from .google_hook import SCOPES, GoogleCredentialsType, default_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+SHEETS_API_URL = "https://sheets.googleapis.com/v4/spreadsheets"
+
+
+class _SheetsSession:
+    """
+    The connection state shared by the async hooks created from one another: an aiohttp
+    session, the bound on concurrent requests and the access token of the service account.
+
+    The token is refreshed by a single coroutine at a time, so concurrent requests made
+    while it is expired wait for one refresh instead of each refreshing it.
+
+    Args:
+        credentials (Credentials): The service account credentials.
+        max_concurrency (int): The maximum number of requests in flight.
+        session (Optional[aiohttp.ClientSession], optional): The session used to send the
+            requests. Defaults to None, which opens one on first use and closes it on `close`.
+    """
+
+    def __init__(
+        self,
+        credentials: Credentials,
+        max_concurrency: int,
+        session: Optional[aiohttp.ClientSession] = None,
+    ) -> None:
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be a positive integer.")
+        self.credentials = credentials
+        self.max_concurrency = max_concurrency
+        self._session = session
+        self._owns_session = session is None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def __bind_loop(self) -> None:
+        """Create the asyncio primitives and the session for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return
+        # Locks, semaphores and sessions can not be used from another loop, e.g. after a new
+        # `asyncio.run`, so they are created again
+        self._loop = loop
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._token_lock = asyncio.Lock()
+        if self._owns_session and self._session is not None:
+            # Closing releases the pooled connections, aiohttp skips them if their loop is closed
+            session, self._session = self._session, None
+            await session.close()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency)
+            )
+            self._owns_session = True
+        return self._session
+
+    async def token(self) -> str:
+        """Get a valid access token, refreshing it first when it is missing or expired."""
+        await self.__bind_loop()
+        async with self._token_lock:
+            if not self.credentials.valid:
+                # google-auth refreshes with a blocking request
+                await asyncio.to_thread(self.credentials.refresh, Request())
+            return self.credentials.token
+
+    async def request(
+        self,
+        method: str,
+        url: URL,
+        *,
+        params: Optional[dict] = None,
+        body: Optional[dict] = None,
+    ) -> dict:
+        """
+        Send an authorised request to the Sheets API.
+
+        Args:
+            method (str): The HTTP method.
+            url (URL): The URL of the request.
+            params (Optional[dict], optional): The query parameters. Defaults to None.
+            body (Optional[dict], optional): The JSON body. Defaults to None.
+
+        Returns:
+            dict: The JSON response.
+
+        Raises:
+            aiohttp.ClientResponseError: If the API responds with an error, with its details
+                as message.
+        """
+        await self.__bind_loop()
+        async with self._semaphore:
+            headers = {"Authorization": f"Bearer {await self.token()}"}
+            async with self.session.request(
+                method, url, params=params, json=body, headers=headers
+            ) as response:
+                if response.status >= 400:
+                    raise aiohttp.ClientResponseError(
+                        response.request_info,
+                        response.history,
+                        status=response.status,
+                        message=await response.text(),
+                        headers=response.headers,
+                    )
+                return await response.json()
+
+    async def close(self) -> None:
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+        self._session = None
+
+
+class AsyncGoogleSheetsHook(BaseHook):
+    """
+    An asyncio hook for interacting with Google Sheets, with the surface of `GoogleSheetsHook`.
+
+    The hook calls the Sheets REST API on a shared aiohttp session, so reads and writes of
+    many worksheets or spreadsheets run concurrently, at most `max_concurrency` at a time.
+    Use `for_spreadsheet` to work on other spreadsheets with the same session, access token,
+    concurrency bound and rate limiter.
+
+    Args:
+        spreadsheet_id (str): The ID of the Google Sheets spreadsheet.
+        credentials (Union[str, dict]): The credentials to authenticate with Google API.
+            It can be either a path to a credentials file or a dictionary containing the credentials.
+        credentials_type (GoogleCredentialsType, optional): The type of credentials provided.
+            Defaults to GoogleCredentialsType.FILE.
+        max_concurrency (int, optional): The maximum number of requests in flight. Defaults to 10.
+        session (Optional[aiohttp.ClientSession], optional): The session used to send the requests,
+            which is not closed by the hook. Defaults to None, which opens one on first use.
+        rate_limiter (Optional[RateLimiter], optional): Schedules the API requests under their
+            quotas and retries rate limit and server errors. Defaults to None, which uses the
+            limiter `GoogleSheetsHook` shares by service account.
+
+    Raises:
+        ValueError: If the credentials file path is invalid or has an unsupported file format.
+        ValueError: If the credentials format is invalid.
+
+    Attributes:
+        spreadsheet_id (str): The ID of the Google Sheets spreadsheet.
+        rate_limiter (RateLimiter): The limiter of the API requests.
+
+    Example:
+        async with AsyncGoogleSheetsHook("spreadsheet_id", credentials="key.json") as hook:
+            frames = await asyncio.gather(
+                *(hook.for_spreadsheet(id).read("Sheet1", return_df=True) for id in ids)
+            )
+
+    """
+
+    def __init__(
+        self,
+        spreadsheet_id: str,
+        *,
+        credentials: Union[str, dict],
+        credentials_type: GoogleCredentialsType = GoogleCredentialsType.FILE,
+        max_concurrency: int = 10,
+        session: Optional[aiohttp.ClientSession] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        credentials = self.__load_credentials(credentials, GoogleCredentialsType(credentials_type))
+        self._client = _SheetsSession(credentials, max_concurrency, session)
+        if rate_limiter is None:
+            account = getattr(credentials, "service_account_email", None)
+            rate_limiter = default_rate_limiter(account)
+        self.rate_limiter = rate_limiter
+        self.spreadsheet_id = spreadsheet_id
+        logger.info("AsyncGoogleSheetsHook initialized Succesfully.")
+
+    @staticmethod
+    def __load_credentials(
+        credentials: Union[str, dict], credentials_type: GoogleCredentialsType
+    ) -> Credentials:
+        if credentials_type == GoogleCredentialsType.FILE:
+            if (
+                isinstance(credentials, str)
+                and os.path.isfile(credentials)
+                and credentials.endswith('.json')
+            ):
+                return Credentials.from_service_account_file(credentials, scopes=SCOPES)
+            raise ValueError("Invalid credentials file path or file format.")
+        try:
+            credentials = json.loads(credentials) if isinstance(credentials, str) else credentials
+        except json.JSONDecodeError:
+            raise ValueError("Invalid credentials format.")
+        return Credentials.from_service_account_info(credentials, scopes=SCOPES)
+
+    def for_spreadsheet(self, spreadsheet_id: str) -> "AsyncGoogleSheetsHook":
+        """
+        Get a hook for another spreadsheet, sharing the session, token, concurrency bound and
+        rate limiter of this one.
+
+        Args:
+            spreadsheet_id (str): The ID of the Google Sheets spreadsheet.
+
+        Returns:
+            AsyncGoogleSheetsHook: The hook of the spreadsheet.
+        """
+        hook = copy.copy(self)
+        hook.spreadsheet_id = spreadsheet_id
+        return hook
+
+    async def close(self) -> None:
+        """Close the session opened by the hook, and by the hooks created from it."""
+        await self._client.close()
+
+    async def __aenter__(self) -> "AsyncGoogleSheetsHook":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def __values_url(self, range_name: Optional[str] = None, action: str = "") -> URL:
+        """Get the URL of a `spreadsheets.values` method, with the range percent-encoded."""
+        url = f"{SHEETS_API_URL}/{quote(self.spreadsheet_id, safe='')}/values"
+        if range_name is not None:
+            url += f"/{quote(range_name, safe='')}"
+        return URL(url + action, encoded=True)
+
+    async def _read(self, method: str, url: URL, **kwargs) -> dict:
+        """Send a read request once the read quota allows it."""
+        return await self.rate_limiter.acall("read", self._client.request, method, url, **kwargs)
+
+    async def _write(self, method: str, url: URL, **kwargs) -> dict:
+        """Send a write request once the write quota allows it."""
+        return await self.rate_limiter.acall("write", self._client.request, method, url, **kwargs)
+
+    async def read(
+        self,
+        worksheet_name: str,
+        table_range: str = None,
+        *,
+        return_df: bool = False,
+        has_headers: bool = True,
+        dtypes: Optional[dict[str, Any]] = None,
+        infer_dtypes: bool = False,
+        value_render_option: Optional[str] = None,
+    ) -> Union[list[list[str]], pd.DataFrame]:
+        """
+        Read data from a worksheet in the Google Sheets spreadsheet.
+
+        Args:
+            worksheet_name (str): The name of the worksheet.
+            table_range (str, optional): The range of cells to read. Defaults to None, which reads all cells.
+            return_df (bool, optional): Whether to return the data as a pandas DataFrame. Defaults to False.
+            has_headers (bool, optional): Whether the data has headers. Defaults to True.
+            dtypes (Optional[dict[str, Any]], optional): The dtype of some DataFrame columns, by name, as in
+                `GoogleSheetsHook.read`. Defaults to None.
+            infer_dtypes (bool, optional): Whether to infer the dtype of the other DataFrame columns, as in
+                `GoogleSheetsHook.read`. Defaults to False.
+            value_render_option (Optional[str], optional): How the API renders the values, as in
+                `GoogleSheetsHook.read`. Defaults to None.
+
+        Returns:
+            Union[list[list[str]], pd.DataFrame]: The read data. If return_df is True, a pandas DataFrame is returned,
+            otherwise a list of lists is returned.
+
+        """
+        params = {key: option.value for key, option in render_options(value_render_option).items()}
+        response = await self._read(
+            "GET",
+            self.__values_url(absolute_range_name(worksheet_name, table_range)),
+            params=params or None,
+        )
+        values = fill_gaps(response.get("values", []))
+        if return_df:
+            return grid_to_frame(values, has_headers, dtypes, infer_dtypes)
+        else:
+            return values
+
+    async def write(
+        self,
+        worksheet_name: str,
+        data: Union[list[list[str]], pd.DataFrame],
+        *,
+        table_range: str = "A1",
+        include_index: bool = False,
+        include_headers: bool = True,
+        raw: bool = False,
+        chunk_cells: Optional[int] = 100000,
+        max_retries: int = 3,
+    ) -> None:
+        """
+        Write data to a worksheet in the Google Sheets spreadsheet.
+
+        Payloads of more than `chunk_cells` cells are split into blocks of rows, each one
+        written to its own offset from the top left cell of `table_range`. The blocks are sent
+        concurrently, within the `max_concurrency` of the hook, and a block failing with a
+        transient error is retried on its own.
+
+        Args:
+            worksheet_name (str): The name of the worksheet.
+            data (Union[list[list[str]], pd.DataFrame]): The data to write. It can be either a list of lists or a pandas DataFrame.
+            table_range (str, optional): The range of cells to write to. Defaults to "A1".
+            include_index (bool, optional): Whether to include the index when writing a pandas DataFrame. Defaults to False.
+            include_headers (bool, optional): Whether to include the headers when writing a pandas DataFrame. Defaults to True.
+            raw (bool, optional): Whether to write the data as raw values. Defaults to False.
+            chunk_cells (Optional[int], optional): The maximum number of cells sent in a single request.
+                Defaults to 100000. None always sends a single request.
+            max_retries (int, optional): The number of times a failed block is retried. Defaults to 3.
+
+        """
+        new_data = adapt_data_for_gsheets(data, include_headers, include_index)
+        blocks = split_blocks(new_data, table_range, chunk_cells)
+        await asyncio.gather(
+            *(
+                self._write(
+                    "PUT",
+                    self.__values_url(absolute_range_name(worksheet_name, block_range)),
+                    params={"valueInputOption": "RAW" if raw else "USER_ENTERED"},
+                    body={"majorDimension": "ROWS", "values": block},
+                    max_retries=max_retries,
+                )
+                for block_range, block in blocks
+            )
+        )
+        logger.info(f"Data written to {worksheet_name} worksheet successfully.")
+
+    async def append(
+        self,
+        worksheet_name: str,
+        data: Union[list[str], pd.Series],
+        *,
+        table_range: str = None,
+        include_index: bool = False,
+        include_headers: bool = False,
+        raw: bool = False,
+    ) -> None:
+        """
+        Append data to a worksheet in the Google Sheets spreadsheet.
+
+        Args:
+            worksheet_name (str): The name of the worksheet.
+            data (Union[list[str], pd.Series]): The data to append. It can be either a list or a pandas Series.
+            table_range (str, optional): The range used to find the table to append to. Defaults to None,
+                which looks for it in the whole worksheet.
+            include_index (bool, optional): Whether to include the index when appending a pandas Series. Defaults to False.
+            include_headers (bool, optional): Whether to include the headers when appending a pandas Series. Defaults to False.
+            raw (bool, optional): Whether to append the data as raw values. Defaults to False.
+
+        """
+        new_data = adapt_data_for_gsheets(data, include_headers, include_index)
+        await self._write(
+            "POST",
+            self.__values_url(absolute_range_name(worksheet_name, table_range), ":append"),
+            params={"valueInputOption": "RAW" if raw else "USER_ENTERED"},
+            body={"majorDimension": "ROWS", "values": new_data},
+        )
+        logger.info(f"Data appended to {worksheet_name} worksheet successfully.")
+
+    async def clear(self, worksheet_name: str, table_range: Union[str, list[str]] = None) -> None:
+        """
+        Clears the data from a specified worksheet in the spreadsheet.
+
+        Args:
+            worksheet_name (str): The name of the worksheet to clear.
+            table_range (Union[str, list[str]], optional): The range of cells or tables to clear. Defaults to None.
+
+        Returns:
+            None
+        """
+        if table_range is None:
+            await self._write(
+                "POST", self.__values_url(absolute_range_name(worksheet_name), ":clear"), body={}
+            )
+            logger.info(f"All data from {worksheet_name} worksheet cleaned successfully.")
+            return
+        table_range = [table_range] if isinstance(table_range, str) else table_range
+        await self._write(
+            "POST",
+            self.__values_url(action=":batchClear"),
+            body={"ranges": [absolute_range_name(worksheet_name, r) for r in table_range]},
+        )
+        logger.info(f"Data cleared from {worksheet_name} worksheet successfully.")
@@ -1,9 +1,37 @@
+import logging
+import os
 import re
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, ContextManager, Dict, Iterator, List, Literal, Optional
 
 from pandas import DataFrame
 
+from ..utils.instrumentation import Instrumentation, QuerySpan
+from ..utils.query_cache import QueryCache
+
+# Tokens of a SQL script, matched in a single linear pass by `DataHook._iter_queries`
+_SQL_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<literal>
+        '[^'\\]*(?:\\.[^'\\]*)*'?   # single quoted strings, with backslash escapes
+        |"[^"]*"?                   # double quoted identifiers
+        |\$\$.*?(?:\$\$|\Z)         # $$ delimited bodies
+    )
+    |(?P<separator>
+        \s+                         # whitespace
+        |(?:--|//)[^\n]*            # single line comments
+        |/\*.*?(?:\*/|\Z)           # block comments
+    )
+    |(?P<semicolon>;)
+    |(?P<word>[^'"$/;\s-]+|.)       # anything else
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+# Used when a hook has no instrumentation, so spans are measured but not reported
+_NO_INSTRUMENTATION = Instrumentation()
+
 
 class BaseHook(ABC):
     pass
@@ -11,55 +39,249 @@ class BaseHook(ABC):
 
 class DataHook(BaseHook):
 
+    cache: Optional[QueryCache] = None
+    instrumentation: Optional[Instrumentation] = None
+
     @abstractmethod
     def fetch_data(self, query: str) -> DataFrame:
         pass
 
-    @staticmethod
-    def _split_queries(query: str) -> List[str]:
+    @abstractmethod
+    def fetch_batches(self, query: str, batch_size: int = 100000) -> Iterator[DataFrame]:
+        pass
+
+    def export(
+        self,
+        query: str,
+        path: str,
+        format: Literal["parquet", "csv"] = "parquet",
+        rows_per_file: int = 1000000,
+        *,
+        batch_size: int = 100000,
+        compression: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
         """
-        Split a SQL query into individual queries.
+        Export the result of a query straight to Parquet or CSV files.
 
-        This method splits a SQL query into individual queries based on the semicolon (;) delimiter,
-        excluding lines that are commented out with "--" or "//" before the semicolon, and considering
-        that "--" and "//" within single or double quotes should not be treated as comments.
+        The result is streamed with `fetch_batches` and each batch is appended to the current
+        file (as a new row group for Parquet) until it holds `rows_per_file` rows, then a new
+        file is started. The full result is never held in memory, so exports of any size run in
+        memory bounded by `batch_size`.
+
+        The Parquet schema is taken from the first batch and promoted when a later batch needs
+        it, e.g. for a column that was all NULL or for a wider decimal. Since a Parquet file has
+        a single schema, a new file is started with the promoted one, so that file can hold
+        fewer than `rows_per_file` rows.
 
         Args:
-            query (str): The SQL query to split.
+            query (str): The SQL query to execute.
+            path (str): The directory to write the files to. It is created if needed.
+            format (Literal["parquet", "csv"], optional): The file format. Defaults to "parquet".
+            rows_per_file (int, optional): The maximum number of rows of each file.
+                Defaults to 1000000.
+            batch_size (int, optional): The number of rows fetched at a time. Defaults to 100000.
+            compression (Optional[str], optional): The compression codec. Defaults to None, which
+                uses snappy for Parquet and no compression for CSV.
 
         Returns:
-            List[str]: A list of individual queries.
+            List[Dict[str, Any]]: The manifest of the export, one {"path", "rows"} entry per file.
+
+        Raises:
+            ValueError: If `rows_per_file` is not a positive integer or the format is unknown.
+            ImportError: If pyarrow is not installed and the format is "parquet".
+        """
+        if rows_per_file <= 0:
+            raise ValueError("rows_per_file must be a positive integer.")
+        if format == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
 
+            extension = ".parquet"
+        elif format == "csv":
+            extension = ".csv.gz" if compression == "gzip" else ".csv"
+        else:
+            raise ValueError(f"Unsupported export format: {format}")
+        os.makedirs(path, exist_ok=True)
+
+        manifest: List[Dict[str, Any]] = []
+        writer = None
+        schema = None
+        file_rows = 0
+
+        def close_file() -> None:
+            nonlocal writer
+            writer.close()
+            writer = None
+            manifest[-1]["rows"] = file_rows
+
+        try:
+            for batch in self.fetch_batches(query, batch_size=min(batch_size, rows_per_file)):
+                start = 0
+                while start < len(batch):
+                    remaining = rows_per_file - file_rows if writer is not None else rows_per_file
+                    chunk = batch.iloc[start : start + remaining]
+                    if format == "parquet":
+                        table = pa.Table.from_pandas(chunk, preserve_index=False)
+                        if schema is None:
+                            schema = table.schema
+                        elif not table.schema.equals(schema, check_metadata=False):
+                            promoted = pa.unify_schemas(
+                                [schema, table.schema], promote_options="permissive"
+                            )
+                            if not promoted.equals(schema, check_metadata=False):
+                                if writer is not None:
+                                    close_file()
+                                schema = promoted
+                            table = table.cast(schema)
+                    if writer is None:
+                        file_path = os.path.join(path, f"part-{len(manifest):05d}{extension}")
+                        manifest.append({"path": file_path, "rows": 0})
+                        file_rows = 0
+                        if format == "parquet":
+                            writer = pq.ParquetWriter(
+                                file_path, schema, compression=compression or "snappy"
+                            )
+                        else:
+                            writer = open(file_path, "wb")
+                    if format == "parquet":
+                        writer.write_table(table)
+                    else:
+                        chunk.to_csv(
+                            writer, header=file_rows == 0, index=False, compression=compression
+                        )
+                    file_rows += len(chunk)
+                    start += len(chunk)
+                    if file_rows >= rows_per_file:
+                        close_file()
+        finally:
+            if writer is not None:
+                close_file()
+
+        logging.info(
+            f"Exported {sum(f['rows'] for f in manifest)} rows to {len(manifest)} file(s) in {path}."
+        )
+        return manifest
+
+    def _span_attributes(self) -> Dict[str, Any]:
+        """
+        Get the attributes recorded on every span of the hook, such as the warehouse.
+
+        Returns:
+            Dict[str, Any]: Initial values of the `QuerySpan` fields.
+        """
+        return {}
+
+    def _span(self, operation: str, query: str) -> ContextManager[QuerySpan]:
         """
+        Record a span of the hook `instrumentation` around a statement.
 
-        def remove_comments(sql: str) -> str:
-            pattern = r"""
-            (['"])(?:(?=(\\?))\2.)*?\1    # match strings
-            |--.*?$                       # match single line comments
-            |//.*?$                       # match single line comments
-            """
-            regex = re.compile(pattern, re.VERBOSE | re.MULTILINE)
+        Args:
+            operation (str): The hook operation, e.g. "fetch" or "execute".
+            query (str): The statement.
 
-            def _replacer(match: re.Match) -> str:
-                if match.group(2) is None:  # Only replace comments
-                    return ''
-                return match.group(0)
+        Returns:
+            ContextManager[QuerySpan]: A context manager yielding the span to fill in.
+        """
+        instrumentation = self.instrumentation or _NO_INSTRUMENTATION
+        return instrumentation.span(
+            operation, query, hook=type(self).__name__, **self._span_attributes()
+        )
 
-            return regex.sub(_replacer, sql)
+    def _cache_context(self) -> Dict[str, Any]:
+        """
+        Get the connection context that query results depend on.
 
-        def split_and_clean(sql: str) -> List[str]:
-            parts = sql.split(";")
-            cleaned_parts = []
-            for part in parts:
-                cleaned_part = ' '.join(part.split())  # Remove extra spaces
-                if cleaned_part:
-                    cleaned_parts.append(cleaned_part + ";")
-            return cleaned_parts
+        Hooks should override this with the attributes that change what a query returns,
+        such as the database, schema or role.
 
-        # Remove comments
-        cleaned_query = remove_comments(query)
+        Returns:
+            Dict[str, Any]: The connection context.
+        """
+        return {}
+
+    def _cache_key(self, query: str, **extra: Any) -> str:
+        """
+        Build the result cache key of a query.
 
-        # Split by semicolon and clean up each part
-        queries = split_and_clean(cleaned_query)
+        The key is built from the normalised queries, so formatting and comment changes still
+        hit the cache, from the connection context of the hook and from the fetch options.
 
-        return queries
+        Args:
+            query (str): The SQL query.
+            **extra: Additional options that change the result, e.g. the fetch engine.
+
+        Returns:
+            str: The cache key.
+        """
+        context = {"hook": type(self).__name__, **self._cache_context()}
+        return QueryCache.make_key(self._split_queries(query), context, extra)
+
+    def invalidate_cache(self, query: Optional[str] = None, **extra: Any) -> None:
+        """
+        Invalidate the cached result of a query, or every cached result if no query is given.
+
+        Args:
+            query (Optional[str], optional): The SQL query. Defaults to None.
+            **extra: The additional options the result was cached with. Defaults to none, which
+                invalidates the results cached with any options.
+        """
+        if self.cache is None:
+            return
+        self.cache.invalidate(self._cache_key(query, **extra) if query is not None else None)
+
+    @staticmethod
+    def _iter_queries(query: str) -> Iterator[str]:
+        """
+        Lazily split a SQL query into individual queries.
+
+        This method scans the query once, token by token, and yields each statement as soon as
+        its terminating semicolon (;) is found, so callers can start running the first statement
+        while the rest of a large script is still being scanned. Quoted strings, double quoted
+        identifiers and `$$` delimited bodies are kept verbatim, so semicolons and comment
+        markers inside them are preserved. "--" and "//" line comments and "/* */" block
+        comments are removed, and any other run of whitespace is collapsed into a single space.
+
+        Args:
+            query (str): The SQL query to split.
+
+        Yields:
+            str: The next individual query, terminated by a semicolon.
+
+        """
+        parts: List[str] = []
+        pending_space = False
+        for match in _SQL_TOKEN_PATTERN.finditer(query):
+            kind = match.lastgroup
+            if kind == "separator":
+                pending_space = bool(parts)
+            elif kind == "semicolon":
+                if parts:
+                    yield "".join(parts) + ";"
+                parts = []
+                pending_space = False
+            else:
+                if pending_space:
+                    parts.append(" ")
+                    pending_space = False
+                parts.append(match.group())
+        if parts:
+            yield "".join(parts) + ";"
+
+    @staticmethod
+    def _split_queries(query: str) -> List[str]:
+        """
+        Split a SQL query into individual queries.
+
+        This method splits a SQL query into individual queries based on the semicolon (;) delimiter,
+        excluding lines that are commented out with "--" or "//" before the semicolon, and considering
+        that "--", "//" and ";" within single or double quotes or `$$` bodies should not be treated
+        as comments or delimiters. See `_iter_queries` for the lazy version.
+
+        Args:
+            query (str): The SQL query to split.
+
+        Returns:
+            List[str]: A list of individual queries.
+
+        """
+        return list(DataHook._iter_queries(query))
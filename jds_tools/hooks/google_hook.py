@@ -1,13 +1,40 @@
+import asyncio
 import enum
+import glob
+import hashlib
+import itertools
 import json
 import logging
+import numbers
 import os
 import sys
-from typing import Union
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Literal, NamedTuple, Optional, Union
 
+import aiohttp
 import gspread
+import numpy as np
 import pandas as pd
-
+import requests
+from gspread.utils import (
+    ValueRenderOption,
+    a1_range_to_grid_range,
+    absolute_range_name,
+    fill_gaps,
+    rowcol_to_a1,
+)
+
+from ..utils.gsheets import (
+    adapt_data_for_gsheets,
+    grid_to_frame,
+    iter_frame_blocks,
+    render_options,
+    split_blocks,
+)
+from ..utils.rate_limit import RateLimiter
 from .base import BaseHook
 
 logger = logging.getLogger(__name__)
@@ -18,12 +45,120 @@ class GoogleCredentialsType(enum.Enum):
     VARIABLE = "variable"
 
 
+# Default per-minute quotas of the Sheets API for a single user, e.g. a service account
+READ_REQUESTS_PER_MINUTE = 60
+WRITE_REQUESTS_PER_MINUTE = 60
+
 SCOPES = [
     'https://www.googleapis.com/auth/spreadsheets',
     # 'https://www.googleapis.com/auth/drive',
 ]
 
 
+# Status codes of the transient API errors worth retrying
+_RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether an error of the Sheets API is transient, i.e. a rate limit, server or network error."""
+    if isinstance(error, gspread.exceptions.APIError):
+        return error.code in _RETRYABLE_STATUS_CODES
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in _RETRYABLE_STATUS_CODES
+    return isinstance(
+        error,
+        (requests.exceptions.RequestException, aiohttp.ClientConnectionError, asyncio.TimeoutError),
+    )
+
+
+def default_rate_limiter(account: Optional[str]) -> RateLimiter:
+    """
+    Get the limiter of the Sheets API quotas of a service account.
+
+    Args:
+        account (Optional[str]): The service account email. Hooks with the same account share
+            a limiter, since the quotas are per account.
+
+    Returns:
+        RateLimiter: The limiter shared by the hooks of the account, or a new one when the
+        account is unknown, since there is nothing to share it by.
+    """
+    quotas = {"read": READ_REQUESTS_PER_MINUTE, "write": WRITE_REQUESTS_PER_MINUTE}
+    if account is None:
+        return RateLimiter(quotas, retry_on=is_retryable)
+    return RateLimiter.shared(account, quotas, retry_on=is_retryable)
+
+
+def _to_grid(values: list[list]) -> np.ndarray:
+    """
+    Build a rectangular object array from rows of values, padding and replacing nulls with "".
+
+    Args:
+        values (list[list]): The rows of values.
+
+    Returns:
+        np.ndarray: The grid of values.
+    """
+    width = max((len(row) for row in values), default=0)
+    grid = np.full((len(values), width), "", dtype=object)
+    for i, row in enumerate(values):
+        grid[i, : len(row)] = row
+    grid[pd.isna(grid)] = ""
+    return grid
+
+
+def _pad_grid(grid: np.ndarray, rows: int, columns: int) -> np.ndarray:
+    """Pad a grid with "" up to the given shape."""
+    padded = np.full((rows, columns), "", dtype=grid.dtype)
+    padded[: grid.shape[0], : grid.shape[1]] = grid
+    return padded
+
+
+class SheetWrite(NamedTuple):
+    """
+    A payload written by `GoogleSheetsHook.write_many`.
+
+    Attributes:
+        worksheet_name (str): The name of the worksheet.
+        data (Union[list[list[str]], pd.DataFrame]): The data to write.
+        table_range (str): The range of cells to write to, only its top left cell is used.
+            Defaults to "A1".
+        include_index (bool): Whether to include the index of a pandas DataFrame. Defaults to False.
+        include_headers (bool): Whether to include the headers of a pandas DataFrame. Defaults to True.
+    """
+
+    worksheet_name: str
+    data: Union[list[list[str]], pd.DataFrame]
+    table_range: str = "A1"
+    include_index: bool = False
+    include_headers: bool = True
+
+
+def _cell_data(value: Any, raw: bool) -> dict:
+    """
+    Build the `CellData` of a value for a `spreadsheets:batchUpdate` request.
+
+    Args:
+        value (Any): The value of the cell. None, NaN and "" leave the cell empty.
+        raw (bool): Whether strings starting with "=" are written as text instead of formulas.
+
+    Returns:
+        dict: The `CellData` setting the user entered value of the cell.
+    """
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)) or value == "":
+        return {}
+    if isinstance(value, (bool, np.bool_)):
+        return {"userEnteredValue": {"boolValue": bool(value)}}
+    if isinstance(value, numbers.Number):
+        # Plain Python numbers, numpy scalars and decimals are not all JSON serialisable
+        number = int(value) if isinstance(value, numbers.Integral) else float(value)
+        return {"userEnteredValue": {"numberValue": number}}
+    value = str(value)
+    if not raw and value.startswith("="):
+        return {"userEnteredValue": {"formulaValue": value}}
+    return {"userEnteredValue": {"stringValue": value}}
+
+
 class GoogleBaseHook(BaseHook):
     """
     A hook for interacting with Google APIs using service account credentials.
@@ -31,6 +166,10 @@ class GoogleBaseHook(BaseHook):
     Args:
         credentials (Union[str, dict]): The path to the credentials file or the credentials as a dictionary.
         credentials_type (GoogleCredentialsType, optional): The type of credentials provided. Defaults to GoogleCredentialsType.FILE.
+        rate_limiter (Optional[RateLimiter], optional): Schedules the "read" and "write" API requests under their
+            quotas and retries rate limit and server errors. Defaults to None, which uses a limiter shared by every
+            hook with the same service account, allowing `READ_REQUESTS_PER_MINUTE` reads and
+            `WRITE_REQUESTS_PER_MINUTE` writes.
 
     Raises:
         ValueError: If the credentials file path is invalid or has an unsupported file format.
@@ -38,6 +177,7 @@ class GoogleBaseHook(BaseHook):
 
     Attributes:
         _gc (gspread.Client): The Google Sheets client object.
+        rate_limiter (RateLimiter): The limiter of the API requests.
 
     """
 
@@ -46,6 +186,7 @@ class GoogleBaseHook(BaseHook):
         credentials: Union[str, dict],
         *,
         credentials_type: GoogleCredentialsType = GoogleCredentialsType.FILE,
+        rate_limiter: Optional[RateLimiter] = None,
     ):
         if credentials_type == GoogleCredentialsType.FILE:
             if os.path.isfile(credentials) and credentials.endswith('.json'):
@@ -60,8 +201,20 @@ class GoogleBaseHook(BaseHook):
                 self._gc = gspread.service_account_from_dict(credentials, scopes=SCOPES)
             except json.JSONDecodeError:
                 raise ValueError("Invalid credentials format.")
+        if rate_limiter is None:
+            account = getattr(self._gc.http_client.auth, "service_account_email", None)
+            rate_limiter = default_rate_limiter(account)
+        self.rate_limiter = rate_limiter
         logger.info("GoogleBaseHook initialized Succesfully.")
 
+    def _read(self, function, *args, **kwargs):
+        """Call a function sending a read request once the read quota allows it."""
+        return self.rate_limiter.call("read", function, *args, **kwargs)
+
+    def _write(self, function, *args, **kwargs):
+        """Call a function sending a write request once the write quota allows it."""
+        return self.rate_limiter.call("write", function, *args, **kwargs)
+
 
 class GoogleSheetsHook(GoogleBaseHook):
     """
@@ -73,6 +226,14 @@ class GoogleSheetsHook(GoogleBaseHook):
             It can be either a path to a credentials file or a dictionary containing the credentials.
         credentials_type (GoogleCredentialsType, optional): The type of credentials provided.
             Defaults to GoogleCredentialsType.FILE.
+        handle_ttl (Optional[float], optional): The number of seconds the spreadsheet and
+            worksheet handles are reused before their metadata is fetched again. Defaults to 300.
+            None keeps them until `refresh` is called or the spreadsheet ID changes.
+        snapshot_dir (Optional[str], optional): The directory where the grids written with
+            `write(..., mode="diff")` are kept between processes. Defaults to None, which only
+            keeps them in memory.
+        rate_limiter (Optional[RateLimiter], optional): Schedules the API requests under their
+            quotas. Defaults to None, which shares a limiter by service account.
 
     Attributes:
         spreadsheet_id (str): The ID of the Google Sheets spreadsheet.
@@ -85,9 +246,19 @@ class GoogleSheetsHook(GoogleBaseHook):
         *,
         credentials: Union[str, dict],
         credentials_type: GoogleCredentialsType = GoogleCredentialsType.FILE,
+        handle_ttl: Optional[float] = 300,
+        snapshot_dir: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
     ):
-        super().__init__(credentials, credentials_type=credentials_type)
+        super().__init__(credentials, credentials_type=credentials_type, rate_limiter=rate_limiter)
         self._spreadsheet_id = spreadsheet_id
+        self.handle_ttl = handle_ttl
+        self._spreadsheet: Optional[gspread.Spreadsheet] = None
+        self._worksheets: dict[str, gspread.Worksheet] = {}
+        self._handles_loaded_at = 0.0
+        self._handles_lock = threading.RLock()
+        self.snapshot_dir = snapshot_dir
+        self._snapshots: dict[tuple[str, str, str], np.ndarray] = {}
 
     @property
     def spreadsheet_id(self) -> str:
@@ -109,6 +280,8 @@ class GoogleSheetsHook(GoogleBaseHook):
             spreadsheet_id (str): The ID of the Google Sheets spreadsheet.
 
         """
+        if spreadsheet_id != self._spreadsheet_id:
+            self.refresh()
         self._spreadsheet_id = spreadsheet_id
 
     @property
@@ -116,29 +289,61 @@ class GoogleSheetsHook(GoogleBaseHook):
         """
         Get the Google Sheets spreadsheet object.
 
+        The spreadsheet is opened on first use and reused for `handle_ttl` seconds.
+
         Returns:
             gspread.Spreadsheet: The Google Sheets spreadsheet object.
 
         """
-        return self._gc.open_by_key(self.spreadsheet_id)
+        with self._handles_lock:
+            if self._spreadsheet is None or self.__handles_expired():
+                self.refresh()
+                self._spreadsheet = self._read(self._gc.open_by_key, self.spreadsheet_id)
+                self._handles_loaded_at = time.monotonic()
+            return self._spreadsheet
+
+    def refresh(self) -> None:
+        """
+        Drop the cached spreadsheet and worksheet handles, so the next call fetches them again.
 
-    def __adapt_data_for_gsheets(
-        self,
-        data: Union[list[list[str]], pd.DataFrame],
-        include_headers: bool,
-        include_index: bool,
-    ):
-        if isinstance(data, pd.DataFrame):
-            new_data = data.to_numpy().tolist()
-            if include_headers:
-                headers = [list(data.columns)]
-                new_data = headers + new_data
-            if include_index:
-                index = data.index.tolist()
-                new_data = [[i] + row for i, row in zip(index, new_data)]
-        else:
-            new_data = data
-        return new_data
+        Call it after worksheets are added, renamed or deleted outside the hook.
+        """
+        with self._handles_lock:
+            self._spreadsheet = None
+            self._worksheets = {}
+
+    def __handles_expired(self) -> bool:
+        return (
+            self.handle_ttl is not None
+            and time.monotonic() - self._handles_loaded_at >= self.handle_ttl
+        )
+
+    def worksheet(self, worksheet_name: str) -> gspread.Worksheet:
+        """
+        Get a worksheet of the spreadsheet by its title.
+
+        The handles of every worksheet are loaded with a single metadata request the first time
+        a title is missing, and reused afterwards.
+
+        Args:
+            worksheet_name (str): The name of the worksheet.
+
+        Returns:
+            gspread.Worksheet: The worksheet object.
+
+        Raises:
+            gspread.WorksheetNotFound: If the spreadsheet has no worksheet with that name.
+        """
+        with self._handles_lock:
+            spreadsheet = self.spreadsheet
+            if worksheet_name not in self._worksheets:
+                self._worksheets = {
+                    sheet.title: sheet for sheet in self._read(spreadsheet.worksheets)
+                }
+            try:
+                return self._worksheets[worksheet_name]
+            except KeyError:
+                raise gspread.WorksheetNotFound(worksheet_name) from None
 
     def read(
         self,
@@ -147,6 +352,9 @@ class GoogleSheetsHook(GoogleBaseHook):
         *,
         return_df: bool = False,
         has_headers: bool = True,
+        dtypes: Optional[dict[str, Any]] = None,
+        infer_dtypes: bool = False,
+        value_render_option: Optional[str] = None,
     ) -> Union[list[list[str]], pd.DataFrame]:
         """
         Read data from a worksheet in the Google Sheets spreadsheet.
@@ -156,22 +364,82 @@ class GoogleSheetsHook(GoogleBaseHook):
             table_range (str, optional): The range of cells to read. Defaults to None, which reads all cells.
             return_df (bool, optional): Whether to return the data as a pandas DataFrame. Defaults to False.
             has_headers (bool, optional): Whether the data has headers. Defaults to True.
+            dtypes (Optional[dict[str, Any]], optional): The dtype of some DataFrame columns, by name,
+                parsed with vectorised conversions (see `jds_tools.utils.gsheets.grid_to_frame`). Defaults to None.
+            infer_dtypes (bool, optional): Whether to parse the other DataFrame columns into booleans, integers,
+                floats or datetimes when every value allows it. Empty cells become missing values. Defaults to False.
+            value_render_option (Optional[str], optional): How the API renders the values: "FORMATTED_VALUE",
+                "UNFORMATTED_VALUE" or "FORMULA". "UNFORMATTED_VALUE" returns numbers and booleans as such, so no
+                text has to be parsed; dates are still returned as text. Defaults to None, which uses
+                "FORMATTED_VALUE".
 
         Returns:
             Union[list[list[str]], pd.DataFrame]: The read data. If return_df is True, a pandas DataFrame is returned,
             otherwise a list of lists is returned.
 
         """
-        sheet = self.spreadsheet.worksheet(worksheet_name)
-        values = sheet.get_all_values(range_name=table_range)
+        sheet = self.worksheet(worksheet_name)
+        options = render_options(value_render_option)
+        values = self._read(
+            sheet.get_all_values,
+            range_name=table_range,
+            value_render_option=options.get("valueRenderOption"),
+            date_time_render_option=options.get("dateTimeRenderOption"),
+        )
         if return_df:
-            headers = values[0] if has_headers else None
-            data = values[1:] if has_headers else values
-            df = pd.DataFrame(data, columns=headers)
-            return df
+            return grid_to_frame(values, has_headers, dtypes, infer_dtypes)
         else:
             return values
 
+    def read_many(
+        self,
+        ranges: dict[str, Optional[str]],
+        *,
+        return_df: bool = False,
+        has_headers: bool = True,
+        dtypes: Optional[dict[str, Any]] = None,
+        infer_dtypes: bool = False,
+        value_render_option: Optional[str] = None,
+    ) -> dict[str, Union[list[list[str]], pd.DataFrame]]:
+        """
+        Read several ranges, from one or many worksheets, with a single API request.
+
+        Args:
+            ranges (dict[str, Optional[str]]): The range of cells to read from each worksheet,
+                by worksheet name. A None range reads all cells of the worksheet.
+            return_df (bool, optional): Whether to return the data as pandas DataFrames. Defaults to False.
+            has_headers (bool, optional): Whether the data has headers. Defaults to True.
+            dtypes (Optional[dict[str, Any]], optional): The dtype of some DataFrame columns, by name, as in `read`.
+                Defaults to None.
+            infer_dtypes (bool, optional): Whether to infer the dtype of the other DataFrame columns, as in `read`.
+                Defaults to False.
+            value_render_option (Optional[str], optional): How the API renders the values, as in `read`.
+                Defaults to None.
+
+        Returns:
+            dict[str, Union[list[list[str]], pd.DataFrame]]: The read data by worksheet name, as
+            `read` returns it.
+
+        Example:
+            data = google_hook.read_many({"Sales": "A1:D100", "Costs": None}, return_df=True)
+
+        """
+        names = list(ranges)
+        params = {key: option.value for key, option in render_options(value_render_option).items()}
+        response = self._read(
+            self.spreadsheet.values_batch_get,
+            [absolute_range_name(name, ranges[name]) for name in names],
+            params=params or None,
+        )
+        result = {}
+        for name, value_range in zip(names, response.get("valueRanges", [])):
+            values = fill_gaps(value_range.get("values", []))
+            result[name] = (
+                grid_to_frame(values, has_headers, dtypes, infer_dtypes) if return_df else values
+            )
+        logger.info(f"Data read from {len(names)} ranges successfully.")
+        return result
+
     def write(
         self,
         worksheet_name: str,
@@ -181,10 +449,21 @@ class GoogleSheetsHook(GoogleBaseHook):
         include_index: bool = False,
         include_headers: bool = True,
         raw: bool = False,
+        chunk_cells: Optional[int] = 100000,
+        max_workers: int = 4,
+        max_retries: int = 3,
+        mode: Literal["full", "diff"] = "full",
     ) -> None:
         """
         Write data to a worksheet in the Google Sheets spreadsheet.
 
+        Payloads of more than `chunk_cells` cells are split into blocks of rows, each one
+        written to its own offset from the top left cell of `table_range`. The blocks are sent
+        concurrently, at most `max_workers` at a time, and a block failing with a transient
+        error (rate limits, server errors, connection errors) is retried on its own. The blocks
+        of a DataFrame are converted one at a time while the previous ones are sent, so the
+        whole grid is never held in memory.
+
         Args:
             worksheet_name (str): The name of the worksheet.
             data (Union[list[list[str]], pd.DataFrame]): The data to write. It can be either a list of lists or a pandas DataFrame.
@@ -192,13 +471,231 @@ class GoogleSheetsHook(GoogleBaseHook):
             include_index (bool, optional): Whether to include the index when writing a pandas DataFrame. Defaults to False.
             include_headers (bool, optional): Whether to include the headers when writing a pandas DataFrame. Defaults to True.
             raw (bool, optional): Whether to write the data as raw values. Defaults to False.
+            chunk_cells (Optional[int], optional): The maximum number of cells sent in a single request.
+                Defaults to 100000. None always sends a single request.
+            max_workers (int, optional): The maximum number of blocks written at the same time. Defaults to 4.
+            max_retries (int, optional): The number of times a failed block is retried. Defaults to 3.
+            mode (Literal["full", "diff"], optional): "full" writes every cell. "diff" compares
+                the data with the grid last written from the same top left cell (see
+                `snapshot_dir`), or with the current values when there is none, and only sends
+                the rectangles of changed rows in a single batch update. Cells left over from a
+                bigger previous grid are blanked. Defaults to "full".
 
         """
-        sheet = self.spreadsheet.worksheet(worksheet_name)
-        new_data = self.__adapt_data_for_gsheets(data, include_headers, include_index)
-        sheet.update(table_range, new_data, raw=raw)
+        sheet = self.worksheet(worksheet_name)
+        if mode == "diff":
+            new_data = adapt_data_for_gsheets(data, include_headers, include_index)
+            self.__write_diff(sheet, worksheet_name, table_range, new_data, raw)
+            return
+        self.__forget_snapshots(worksheet_name)
+        if isinstance(data, pd.Series):
+            data = data.to_frame().T
+        if isinstance(data, pd.DataFrame) and chunk_cells is not None:
+            blocks = iter_frame_blocks(
+                data, table_range, chunk_cells, include_headers, include_index
+            )
+        else:
+            new_data = adapt_data_for_gsheets(data, include_headers, include_index)
+            blocks = iter(split_blocks(new_data, table_range, chunk_cells))
+        first_block = next(blocks)
+        second_block = next(blocks, None)
+        if second_block is None:
+            self.__update_block(sheet, table_range, first_block[1], raw, max_retries)
+        else:
+            written = 0
+            with ThreadPoolExecutor(max(1, max_workers)) as executor:
+                pending = deque()
+                for block_range, block in itertools.chain([first_block, second_block], blocks):
+                    pending.append(
+                        executor.submit(
+                            self.__update_block, sheet, block_range, block, raw, max_retries
+                        )
+                    )
+                    written += 1
+                    # The next block is only converted once a worker is free to send it
+                    if len(pending) >= max_workers:
+                        pending.popleft().result()
+                for future in pending:
+                    future.result()
+            logger.info(f"Data written to {worksheet_name} worksheet in {written} blocks.")
         logger.info(f"Data written to {worksheet_name} worksheet successfully.")
 
+    def __write_diff(
+        self,
+        sheet: gspread.Worksheet,
+        worksheet_name: str,
+        table_range: str,
+        values: list[list],
+        raw: bool,
+    ) -> None:
+        """Write only the rectangles of changed rows, compared with the last written grid."""
+        grid_range = a1_range_to_grid_range(table_range)
+        first_row = grid_range.get("startRowIndex", 0) + 1
+        first_column = grid_range.get("startColumnIndex", 0) + 1
+        anchor = rowcol_to_a1(first_row, first_column)
+
+        new = _to_grid(values)
+        new_text = new.astype(str)
+        old_text = self.__load_snapshot(worksheet_name, anchor)
+        if old_text is None:
+            if new.size:
+                end = rowcol_to_a1(first_row + new.shape[0] - 1, first_column + new.shape[1] - 1)
+                current = self._read(
+                    sheet.get_values,
+                    f"{anchor}:{end}",
+                    value_render_option=ValueRenderOption.formula,
+                )
+            else:
+                current = []
+            old_text = _to_grid(current).astype(str)
+
+        shape = np.maximum(new.shape, old_text.shape)
+        changed = _pad_grid(new_text, *shape) != _pad_grid(old_text, *shape)
+        new = _pad_grid(new, *shape)
+        changed_rows = np.flatnonzero(changed.any(axis=1))
+        updates = []
+        # Consecutive changed rows form a block, written from its first to its last changed column
+        for rows in np.split(changed_rows, np.flatnonzero(np.diff(changed_rows) != 1) + 1):
+            if not rows.size:
+                continue
+            start, stop = rows[0], rows[-1] + 1
+            columns = np.flatnonzero(changed[start:stop].any(axis=0))
+            left, right = columns[0], columns[-1] + 1
+            block_range = (
+                f"{rowcol_to_a1(first_row + start, first_column + left)}:"
+                f"{rowcol_to_a1(first_row + stop - 1, first_column + right - 1)}"
+            )
+            updates.append({"range": block_range, "values": new[start:stop, left:right].tolist()})
+        if updates:
+            self._write(sheet.batch_update, updates, raw=raw)
+        self.__save_snapshot(worksheet_name, anchor, new_text)
+        logger.info(
+            f"Data written to {worksheet_name} worksheet successfully "
+            f"({int(changed.sum())} changed cells in {len(updates)} blocks)."
+        )
+
+    def __snapshot_path(self, worksheet_name: str, anchor: str = "*") -> str:
+        name = hashlib.sha1(f"{self.spreadsheet_id}/{worksheet_name}".encode()).hexdigest()
+        return os.path.join(self.snapshot_dir, f"{name}_{anchor}.json")
+
+    def __load_snapshot(self, worksheet_name: str, anchor: str) -> Optional[np.ndarray]:
+        key = (self.spreadsheet_id, worksheet_name, anchor)
+        if key not in self._snapshots and self.snapshot_dir is not None:
+            path = self.__snapshot_path(worksheet_name, anchor)
+            if os.path.isfile(path):
+                with open(path, "r") as f:
+                    self._snapshots[key] = _to_grid(json.load(f)).astype(str)
+        return self._snapshots.get(key)
+
+    def __save_snapshot(self, worksheet_name: str, anchor: str, grid: np.ndarray) -> None:
+        self._snapshots[(self.spreadsheet_id, worksheet_name, anchor)] = grid
+        if self.snapshot_dir is not None:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            with open(self.__snapshot_path(worksheet_name, anchor), "w") as f:
+                json.dump(grid.tolist(), f)
+
+    def __forget_snapshots(self, worksheet_name: str) -> None:
+        """Drop the snapshots of a worksheet, once it is written by other means than a diff."""
+        for key in [
+            key for key in self._snapshots if key[:2] == (self.spreadsheet_id, worksheet_name)
+        ]:
+            del self._snapshots[key]
+        if self.snapshot_dir is not None:
+            for path in glob.glob(self.__snapshot_path(worksheet_name)):
+                os.remove(path)
+
+    def __update_block(
+        self,
+        sheet: gspread.Worksheet,
+        table_range: str,
+        values: list[list],
+        raw: bool,
+        max_retries: int,
+    ) -> None:
+        """Write a block of values, retrying transient errors on their own."""
+        self._write(sheet.update, table_range, values, raw=raw, max_retries=max_retries)
+
+    def write_many(
+        self,
+        writes: Iterable[Union[SheetWrite, tuple, dict]],
+        *,
+        clear_ranges: Optional[dict[str, Union[str, list[str], None]]] = None,
+        raw: bool = False,
+    ) -> None:
+        """
+        Write and clear several ranges, from one or many worksheets, with a single API request.
+
+        Everything is sent as one `spreadsheets:batchUpdate` request, which the API applies
+        atomically: either every clear and write lands or none does. The clears are applied
+        before the writes, so a range can be cleared and rewritten in the same call.
+
+        Unlike `write`, values are not parsed as if typed in the UI: numbers and booleans keep
+        their type and strings are written as text, except formulas when `raw` is False.
+
+        Args:
+            writes (Iterable[Union[SheetWrite, tuple, dict]]): The payloads to write, as
+                `SheetWrite` objects or the tuples or dicts of their fields.
+            clear_ranges (Optional[dict[str, Union[str, list[str], None]]], optional): The range
+                or ranges of cells to clear, by worksheet name. A None range clears the whole
+                worksheet. Defaults to None.
+            raw (bool, optional): Whether to write strings starting with "=" as text. Defaults to False.
+
+        Example:
+            google_hook.write_many(
+                [SheetWrite("Sales", sales_df), SheetWrite("Costs", costs_df, "B2")],
+                clear_ranges={"Sales": "A:Z", "Costs": "B2:Z"},
+            )
+
+        """
+        batch_requests, touched = [], set()
+        for worksheet_name, table_ranges in (clear_ranges or {}).items():
+            sheet_id = self.worksheet(worksheet_name).id
+            if table_ranges is None:
+                table_ranges = [None]
+            elif isinstance(table_ranges, str):
+                table_ranges = [table_ranges]
+            for table_range in table_ranges:
+                grid_range = (
+                    a1_range_to_grid_range(table_range, sheet_id)
+                    if table_range
+                    else {"sheetId": sheet_id}
+                )
+                batch_requests.append(
+                    {"updateCells": {"range": grid_range, "fields": "userEnteredValue"}}
+                )
+        for write in writes:
+            if isinstance(write, dict):
+                write = SheetWrite(**write)
+            elif not isinstance(write, SheetWrite):
+                write = SheetWrite(*write)
+            sheet_id = self.worksheet(write.worksheet_name).id
+            touched.add(write.worksheet_name)
+            grid_range = a1_range_to_grid_range(write.table_range)
+            values = adapt_data_for_gsheets(write.data, write.include_headers, write.include_index)
+            batch_requests.append(
+                {
+                    "updateCells": {
+                        "start": {
+                            "sheetId": sheet_id,
+                            "rowIndex": grid_range.get("startRowIndex", 0),
+                            "columnIndex": grid_range.get("startColumnIndex", 0),
+                        },
+                        "rows": [
+                            {"values": [_cell_data(value, raw) for value in row]} for row in values
+                        ],
+                        "fields": "userEnteredValue",
+                    }
+                }
+            )
+        if not batch_requests:
+            return
+        for worksheet_name in set(clear_ranges or {}) | touched:
+            self.__forget_snapshots(worksheet_name)
+        self._write(self.spreadsheet.batch_update, {"requests": batch_requests})
+        logger.info(
+            f"{len(batch_requests)} ranges written and cleared in a single request successfully."
+        )
+
     def append(
         self,
         worksheet_name: str,
@@ -220,10 +717,14 @@ class GoogleSheetsHook(GoogleBaseHook):
             raw (bool, optional): Whether to append the data as raw values. Defaults to False.
 
         """
-        sheet = self.spreadsheet.worksheet(worksheet_name)
-        new_data = self.__adapt_data_for_gsheets(data, include_headers, include_index)
-        sheet.append_rows(
-            new_data, value_input_option="RAW" if raw else "USER_ENTERED", table_range=table_range
+        sheet = self.worksheet(worksheet_name)
+        new_data = adapt_data_for_gsheets(data, include_headers, include_index)
+        self.__forget_snapshots(worksheet_name)
+        self._write(
+            sheet.append_rows,
+            new_data,
+            value_input_option="RAW" if raw else "USER_ENTERED",
+            table_range=table_range,
         )
         logger.info(f"Data appended to {worksheet_name} worksheet successfully.")
 
@@ -238,11 +739,12 @@ class GoogleSheetsHook(GoogleBaseHook):
         Returns:
             None
         """
-        sheet = self.spreadsheet.worksheet(worksheet_name)
+        sheet = self.worksheet(worksheet_name)
+        self.__forget_snapshots(worksheet_name)
         if table_range is None:
-            sheet.clear()
+            self._write(sheet.clear)
             logger.info(f"All data from {worksheet_name} worksheet cleaned successfully.")
             return
         table_range = [table_range] if isinstance(table_range, str) else table_range
-        sheet.batch_clear(table_range)
+        self._write(sheet.batch_clear, table_range)
         logger.info(f"Data cleared from {worksheet_name} worksheet successfully.")
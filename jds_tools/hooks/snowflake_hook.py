@@ -1,16 +1,117 @@
+import asyncio
+import functools
 import logging
-from typing import List, Literal, Optional, Union
+import math
+import numbers
+import os
+import re
+import tempfile
+import threading
+import uuid
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterator, List, Literal, Optional, Sequence, Union
 
 import pandas as pd
+from snowflake.connector.constants import FIELD_ID_TO_NAME
+from snowflake.connector.errors import Error as SnowflakeError
 from snowflake.sqlalchemy import URL
-from sqlalchemy import create_engine
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DisconnectionError, SQLAlchemyError
 
+from ..utils.dtypes import (
+    ColumnType,
+    frame_from_rows,
+    optimize_dtypes as optimize_frame_dtypes,
+    pin_text_dtypes,
+)
+from ..utils.instrumentation import Instrumentation, QuerySpan
+from ..utils.query_cache import QueryCache
+from ..utils.state_store import StateStore
 from .base import DataHook
 
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
 # Set up the logger
 logger = logging.getLogger(__name__)
 
+# Key of the session context applied to a pooled connection, stored in its pool record info
+_SESSION_CONTEXT_KEY = "jds_tools_session_context"
+
+
+def _write_stage_file(data: pd.DataFrame, path: str, file_format: str) -> str:
+    """
+    Serialise a DataFrame to a compressed file ready to be PUT to a Snowflake stage.
+
+    Args:
+        data (pd.DataFrame): The data to serialise.
+        path (str): The destination path, without extension.
+        file_format (str): Either "parquet" (snappy compressed) or "csv" (gzip compressed).
+
+    Returns:
+        str: The path of the written file.
+    """
+    if file_format == "parquet":
+        path = f"{path}.parquet"
+        data.to_parquet(
+            path,
+            index=False,
+            compression="snappy",
+            coerce_timestamps="us",
+            allow_truncated_timestamps=True,
+        )
+    else:
+        path = f"{path}.csv.gz"
+        data.to_csv(path, index=False, header=False, compression="gzip")
+    return path
+
+
+def _column_types(description: Sequence) -> List[ColumnType]:
+    """
+    Map Snowflake cursor metadata to the logical column types used by `optimize_dtypes`.
+
+    Args:
+        description (Sequence): The cursor description, one `ResultMetadata` per column.
+
+    Returns:
+        List[ColumnType]: The logical type of each column, in order.
+    """
+    column_types = []
+    for column in description or []:
+        type_name, precision, scale = FIELD_ID_TO_NAME[column[1]], column[4], column[5]
+        if type_name == "FIXED":
+            kind = "decimal" if scale else "integer"
+        elif type_name.startswith("TIMESTAMP"):
+            kind = "timestamp"
+        else:
+            kind = {"REAL": "float", "TEXT": "text", "DATE": "date", "BOOLEAN": "boolean"}.get(
+                type_name, "other"
+            )
+        column_types.append(ColumnType(kind, precision, scale))
+    return column_types
+
+
+def _query_id(result) -> Optional[str]:
+    """
+    Get the Snowflake query id of a SQLAlchemy result.
+
+    The id is read from the execution context, since SQLAlchemy drops `result.cursor` once a
+    result without rows, or fully fetched, is closed.
+
+    Args:
+        result: The SQLAlchemy result.
+
+    Returns:
+        Optional[str]: The query id, or None if the driver did not provide one.
+    """
+    cursor = getattr(getattr(result, "context", None), "cursor", None)
+    return getattr(cursor, "sfqid", None)
+
 
 class SnowflakeHook(DataHook):
     """
@@ -19,6 +120,10 @@ class SnowflakeHook(DataHook):
     This class provides methods to connect to a Snowflake database, execute SQL queries,
     fetch data, and upload data to Snowflake.
 
+    The SQLAlchemy engine is created lazily on first use. Changing the warehouse, database,
+    schema or role does not rebuild it: pooled connections are switched with `USE` statements
+    the next time they are checked out. Use `configure` to apply several changes at once.
+
     Args:
         account (str): The Snowflake account name.
         user (str): The Snowflake user name.
@@ -27,6 +132,11 @@ class SnowflakeHook(DataHook):
         database (Optional[str], optional): The Snowflake database name. Defaults to None.
         schema (Optional[str]): The Snowflake schema to use. Defaults to None.
         role (Optional[str], optional): The Snowflake role name. Defaults to None.
+        cache (Optional[QueryCache], optional): The cache used by `fetch_data`. Defaults to None.
+        async_max_workers (int, optional): The number of threads running blocking driver calls
+            for the async API. Defaults to 8.
+        instrumentation (Optional[Instrumentation], optional): Receives a span with the timing,
+            query id and row count of every statement. Defaults to None.
     """
 
     def __init__(
@@ -38,6 +148,9 @@ class SnowflakeHook(DataHook):
         database: Optional[str] = None,
         schema: Optional[str] = None,
         role: Optional[str] = None,
+        cache: Optional[QueryCache] = None,
+        async_max_workers: int = 8,
+        instrumentation: Optional[Instrumentation] = None,
     ) -> None:
         """
         Initializes a SnowflakeHook object.
@@ -50,6 +163,12 @@ class SnowflakeHook(DataHook):
             database (Optional[str]): The Snowflake database to use. Defaults to None.
             schema (Optional[str]): The Snowflake schema to use. Defaults to None.
             role (Optional[str]): The Snowflake role to use. Defaults to None.
+            cache (Optional[QueryCache]): The result cache used by `fetch_data`. Defaults to None,
+                which disables caching.
+            async_max_workers (int): The number of threads running blocking driver calls for
+                `afetch_data` and `aexecute_statement`. Defaults to 8.
+            instrumentation (Optional[Instrumentation]): Receives a `QuerySpan` per statement.
+                Defaults to None, which disables instrumentation.
         """
         self._account = account
         self._user = user
@@ -58,8 +177,14 @@ class SnowflakeHook(DataHook):
         self._database = database
         self._schema = schema
         self._role = role
-        self.__url: str = None
-        self.__update_engine()
+        self.cache = cache
+        self.instrumentation = instrumentation
+        self._pool_size = 5
+        self._engine: Optional[Engine] = None
+        self.__engine_context: Optional[tuple] = None
+        self.__engine_lock = threading.RLock()
+        self._async_max_workers = async_max_workers
+        self.__async_executor: Optional[ThreadPoolExecutor] = None
 
     @property
     def account(self) -> str:
@@ -95,7 +220,7 @@ class SnowflakeHook(DataHook):
     @warehouse.setter
     def warehouse(self, value: str) -> None:
         self._warehouse = value
-        self.__update_engine()
+        self.__update_session_context()
 
     @property
     def database(self) -> Optional[str]:
@@ -104,7 +229,7 @@ class SnowflakeHook(DataHook):
     @database.setter
     def database(self, value: Optional[str]) -> None:
         self._database = value
-        self.__update_engine()
+        self.__update_session_context()
 
     @property
     def schema(self) -> Optional[str]:
@@ -113,7 +238,7 @@ class SnowflakeHook(DataHook):
     @schema.setter
     def schema(self, value: Optional[str]) -> None:
         self._schema = value
-        self.__update_engine()
+        self.__update_session_context()
 
     @property
     def role(self) -> Optional[str]:
@@ -122,11 +247,51 @@ class SnowflakeHook(DataHook):
     @role.setter
     def role(self, value: Optional[str]) -> None:
         self._role = value
-        self.__update_engine()
+        self.__update_session_context()
 
     @property
     def url(self) -> str:
-        return self.__url.replace(f"{self.user}:{self.__password}", f"{self.user}:{self.password}")
+        url = URL(**self.connection_data)
+        return url.replace(f"{self.user}:{self.__password}", f"{self.user}:{self.password}")
+
+    @property
+    def engine(self) -> Engine:
+        """
+        Get the Snowflake connection engine, creating it on first use.
+
+        The engine is created under a lock, so threads asking for it at the same time share a
+        single engine and connection pool.
+
+        Returns:
+            Engine: The SQLAlchemy engine object for the Snowflake connection.
+        """
+        engine = self._engine
+        if engine is not None:
+            return engine
+        with self.__engine_lock:
+            if self._engine is None:
+                logging.info("Creating Snowflake url and engine.")
+                context = self.__session_context()
+                # Unbounded overflow, so callers with more workers than pooled connections open
+                # extra ones instead of waiting, and the pool never has to be rebuilt
+                engine = create_engine(
+                    URL(**self.connection_data), pool_size=self._pool_size, max_overflow=-1
+                )
+
+                def on_connect(dbapi_connection, connection_record) -> None:
+                    # New connections already use the context the engine url was built with
+                    connection_record.info[_SESSION_CONTEXT_KEY] = context
+
+                event.listen(engine, "connect", on_connect)
+                event.listen(engine, "checkout", self.__apply_session_context)
+                self.__engine_context = context
+                self._engine = engine
+            return self._engine
+
+    @engine.setter
+    def engine(self, value: Optional[Engine]) -> None:
+        with self.__engine_lock:
+            self._engine = value
 
     @property
     def connection_data(self) -> dict:
@@ -152,6 +317,19 @@ class SnowflakeHook(DataHook):
             if value is not None
         }
 
+    def _cache_context(self) -> dict:
+        return {
+            "account": self.account,
+            "user": self.user,
+            "warehouse": self.warehouse,
+            "database": self.database,
+            "schema": self.schema,
+            "role": self.role,
+        }
+
+    def _span_attributes(self) -> dict:
+        return {"warehouse": self.warehouse}
+
     def __str__(self) -> str:
         """
         Returns a string representation of the SnowflakeHook object with the password masked.
@@ -175,24 +353,159 @@ class SnowflakeHook(DataHook):
         """
         Update the Snowflake connection engine.
 
-        This method updates the connection data and creates a new SQLAlchemy engine object
-        for the Snowflake connection.
+        This method disposes the current SQLAlchemy engine, so a new one is created with the
+        updated connection data on its next use.
 
         Args:
             **kwards: Optional keyword arguments to update the connection data.
 
         """
         logging.info("Updating Snowflake url and engine.")
-        self.dispose_engine()
-        self.__url = URL(**self.connection_data)
-        self.engine = create_engine(self.__url)
+        with self.__engine_lock:
+            if self._engine is not None:
+                self._engine.dispose()
+            self._engine = None
+
+    def __session_context(self) -> tuple:
+        """Get the session context, in the order its `USE` statements must be applied."""
+        return (
+            ("ROLE", self.role),
+            ("WAREHOUSE", self.warehouse),
+            ("DATABASE", self.database),
+            ("SCHEMA", self.schema),
+        )
+
+    def __update_session_context(self) -> None:
+        """
+        Apply a warehouse, database, schema or role change.
+
+        Pooled connections are switched lazily on checkout, so the engine is kept. It is only
+        rebuilt when a value is unset, since a `USE` statement cannot clear it.
+
+        """
+        if self._engine is None or self.__engine_context is None:
+            return
+        if any(
+            value is None and built is not None
+            for (_, value), (_, built) in zip(self.__session_context(), self.__engine_context)
+        ):
+            self.__update_engine()
+
+    def __apply_session_context(self, dbapi_connection, connection_record, connection_proxy):
+        """Switch a pooled connection to the current session context when it is checked out."""
+        context = self.__session_context()
+        applied = connection_record.info.get(_SESSION_CONTEXT_KEY)
+        if applied == context:
+            return
+        if applied is not None and any(
+            value is None and previous is not None
+            for (_, value), (_, previous) in zip(context, applied)
+        ):
+            # A USE statement cannot unset a value, the pool retries with a fresh connection
+            raise DisconnectionError("Session context cannot be reverted on this connection.")
+        cursor = dbapi_connection.cursor()
+        try:
+            for kind, value in context:
+                if value is not None:
+                    cursor.execute(f"USE {kind} {value}")
+        finally:
+            cursor.close()
+        connection_record.info[_SESSION_CONTEXT_KEY] = context
+
+    def configure(self, **changes) -> None:
+        """
+        Apply several connection changes at once.
+
+        Credential changes (account, user or password) dispose the engine a single time,
+        while warehouse, database, schema and role changes keep the pooled connections.
+
+        Args:
+            **changes: The new values of account, user, password, warehouse, database,
+                schema and/or role.
+
+        Raises:
+            ValueError: If an unknown connection attribute is given.
 
-    def execute_statement(self, query: str) -> None:
+        Example:
+            hook.configure(database="analytics", schema="public", role="analyst")
+        """
+        credentials = {"account", "user", "password"}
+        unknown = set(changes) - credentials - {"warehouse", "database", "schema", "role"}
+        if unknown:
+            raise ValueError(f"Unknown connection attributes: {sorted(unknown)}")
+        for key, value in changes.items():
+            if key == "password":
+                self.__password = value
+            else:
+                setattr(self, f"_{key}", value)
+        if credentials & set(changes):
+            self.__update_engine()
+        else:
+            self.__update_session_context()
+
+    @contextmanager
+    def using(self, **changes) -> Iterator["SnowflakeHook"]:
+        """
+        Temporarily apply connection changes, restoring the previous values on exit.
+
+        Args:
+            **changes: The values to apply, as accepted by `configure`.
+
+        Yields:
+            SnowflakeHook: The hook itself.
+
+        Example:
+            for database in ["db_1", "db_2"]:
+                with hook.using(database=database, schema="raw"):
+                    hook.fetch_data("SELECT COUNT(*) FROM events")
+        """
+        previous = {
+            key: self.__password if key == "password" else getattr(self, f"_{key}", None)
+            for key in changes
+        }
+        self.configure(**changes)
+        try:
+            yield self
+        finally:
+            self.configure(**previous)
+
+    def __ensure_pool_size(self, size: int) -> None:
+        """
+        Size the engine connection pool for `size` concurrent connections.
+
+        The pool is only sized when the engine is built, which happens right away, before any
+        worker thread asks for it. An existing engine is never rebuilt, since other callers may
+        be using its connections: the extra connections are opened as pool overflow instead.
+
+        Args:
+            size (int): The number of connections that will be used concurrently.
+
+        """
+        with self.__engine_lock:
+            if self._engine is None:
+                self._pool_size = max(self._pool_size, size)
+            self.engine
+
+    def execute_statement(
+        self, query: Union[str, List[str]], *, max_workers: Optional[int] = None
+    ) -> None:
         """
         Executes the given SQL query or queries on the Snowflake database.
 
+        By default every statement runs in order on a single connection. When `max_workers` is
+        greater than one, the statements of a script are treated as independent and run
+        concurrently over pooled connections, at most `max_workers` at a time. Passing a list of
+        scripts defines dependency groups: each group only starts once every statement of the
+        previous one has finished, so ordering is kept where it matters.
+
+        Note that in parallel mode each statement may run on a different session, so session
+        scoped statements (`BEGIN`/`COMMIT`, `USE ...`, temporary objects) should not be used.
+
         Args:
-            query (str): The SQL query or queries to execute. Multiple queries should be separated by ';'.
+            query (Union[str, List[str]]): The SQL query or queries to execute. Multiple queries
+                should be separated by ';'. A list of scripts is run group by group.
+            max_workers (Optional[int], optional): The maximum number of statements to run at the
+                same time. Defaults to None, which runs the statements sequentially.
 
         Raises:
             SQLAlchemyError: If there is an error executing the query.
@@ -200,17 +513,54 @@ class SnowflakeHook(DataHook):
         Returns:
             None
         """
+        groups = [query] if isinstance(query, str) else query
         try:
-            individual_queries = self._split_queries(query)
-            with self.engine.connect() as connection:
-                for q in individual_queries:
-                    connection.execute(q)
+            if max_workers is None or max_workers <= 1:
+                with self.engine.connect() as connection:
+                    for group in groups:
+                        for q in self._iter_queries(group):
+                            with self._span("execute", q) as span:
+                                self.__execute_on(connection, q, span)
+            else:
+                self.__ensure_pool_size(max_workers)
+                with ThreadPoolExecutor(max_workers) as executor:
+                    for group in groups:
+                        futures = [
+                            executor.submit(self.__execute_single, q)
+                            for q in self._iter_queries(group)
+                        ]
+                        for future in as_completed(futures):
+                            future.result()
             logging.info("Query executed successfully on Snowflake.")
         except SQLAlchemyError as e:
             logging.error(f"Error trying to execute query on Snowflake. Details: {e}")
             raise
 
-    def fetch_data(self, query: str, data_return: bool = True) -> Union[pd.DataFrame, None]:
+    def __execute_single(self, query: str) -> None:
+        """Execute a single statement on its own pooled connection."""
+        with self._span("execute", query) as span:
+            with span.phase("connect"):
+                connection = self.engine.connect()
+            with connection as connection:
+                self.__execute_on(connection, query, span)
+
+    def __execute_on(self, connection, query: str, span: QuerySpan) -> None:
+        """Execute a single statement on the given connection, recording it in the span."""
+        with span.phase("execute"):
+            result = connection.execute(query)
+        span.query_id = _query_id(result)
+        # The DB-API rowcount is -1 when the driver does not know it
+        rowcount = getattr(result, "rowcount", -1)
+        span.rows = rowcount if isinstance(rowcount, int) and rowcount >= 0 else None
+
+    def fetch_data(
+        self,
+        query: str,
+        data_return: bool = True,
+        engine: Literal["sqlalchemy", "arrow"] = "sqlalchemy",
+        use_cache: bool = True,
+        optimize_dtypes: bool = False,
+    ) -> Union[pd.DataFrame, None]:
         """
         Fetch data from Snowflake.
 
@@ -221,21 +571,382 @@ class SnowflakeHook(DataHook):
             query (str): The SQL query to execute.
             data_return (bool, optional): Whether to return the fetched data as a DataFrame.
                 Defaults to True.
+            engine (Literal["sqlalchemy", "arrow"], optional): The fetch path to use. "arrow"
+                builds an Arrow-backed DataFrame from the connector's Arrow result batches
+                (see `fetch_arrow`). Defaults to "sqlalchemy".
+            use_cache (bool, optional): Whether to serve and store the result through the hook
+                `cache`, when one is configured. Defaults to True.
+            optimize_dtypes (bool, optional): Whether to convert the columns to memory efficient
+                dtypes driven by the cursor column metadata (see `jds_tools.utils.dtypes`). Only
+                used by the "sqlalchemy" engine, the Arrow path is already typed. Defaults to False.
 
         Returns:
             Union[pd.DataFrame, None]: The fetched data as a pandas DataFrame, or None if
             `data_return` is set to False.
 
         """
+        cache_key = None
+        if self.cache is not None and use_cache and data_return:
+            extra = {"optimize_dtypes": True} if optimize_dtypes else {}
+            cache_key = self._cache_key(query, engine=engine, **extra)
+            df = self.cache.get(cache_key)
+            if df is not None:
+                logging.info("Data fetched from the query cache.")
+                return df
         try:
-            with self.engine.connect() as connection:
-                result = connection.execute(query)
-            logging.info("Data fetched from Snowflake.")
-            return pd.DataFrame(result.fetchall(), columns=result.keys()) if data_return else None
-        except SQLAlchemyError as e:
+            if engine == "arrow":
+                df = self.fetch_arrow(query, as_dataframe=True)
+            else:
+                df = self.__fetch_frame(query, optimize_dtypes=optimize_dtypes)
+                logging.info("Data fetched from Snowflake.")
+            if cache_key is not None:
+                self.cache.set(cache_key, df)
+            return df if data_return else None
+        except (SQLAlchemyError, SnowflakeError) as e:
             logging.error(f"Error trying to fetch data from Snowflake. Details: {e}")
             return pd.DataFrame() if data_return else None
 
+    def __fetch_frame(
+        self, query: str, optimize_dtypes: bool = False, parameters: Optional[dict] = None
+    ) -> pd.DataFrame:
+        """Execute a query on a pooled connection and build a DataFrame, raising on errors."""
+        with self._span("fetch", query) as span:
+            with span.phase("connect"):
+                connection = self.engine.connect()
+            with connection as connection:
+                with span.phase("execute"):
+                    if parameters:
+                        # Bound client side by the connector (pyformat), so literal % is escaped
+                        result = connection.exec_driver_sql(query, parameters)
+                    else:
+                        result = connection.execute(query)
+                span.query_id = _query_id(result)
+                columns = list(result.keys())
+                column_types = _column_types(result.cursor.description) if optimize_dtypes else None
+                with span.phase("fetch"):
+                    rows = result.fetchall()
+            with span.phase("build"):
+                if optimize_dtypes:
+                    df = frame_from_rows(rows, columns)
+                    df = optimize_frame_dtypes(df, dict(zip(columns, column_types)))
+                else:
+                    df = pd.DataFrame(rows, columns=columns)
+            span.rows = len(df)
+            span.bytes = int(df.memory_usage(index=False).sum())
+        return df
+
+    def fetch_incremental(
+        self,
+        query_or_table: str,
+        watermark_column: str,
+        state_store: StateStore,
+        *,
+        key: Optional[str] = None,
+        initial_value=None,
+        optimize_dtypes: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Fetch only the rows added or changed since the previous call.
+
+        The highest value of `watermark_column` returned by each call is saved in the state
+        store, and the next call only fetches the rows strictly above it. The watermark is only
+        advanced once the delta has been fetched successfully, so a failed run is simply
+        retried by the next one. A delta whose watermarks are all NULL keeps the previous one.
+
+        Args:
+            query_or_table (str): A table name or a SQL query to extract incrementally.
+            watermark_column (str): A monotonically increasing column, such as an update
+                timestamp or an auto-incremented id.
+            state_store (StateStore): Where the watermark is persisted, e.g. a
+                `JsonStateStore` or a `SQLiteStateStore`.
+            key (Optional[str], optional): The state key of this extract. Defaults to None,
+                which derives it from the normalised query, the database, the schema and the
+                watermark column, so switching the warehouse or role keeps the watermark.
+            initial_value (optional): The watermark to start from when none has been saved
+                yet. Defaults to None, which fetches every row on the first call.
+            optimize_dtypes (bool, optional): Whether to convert the columns to memory
+                efficient dtypes. Defaults to False.
+
+        Returns:
+            pd.DataFrame: The rows beyond the saved watermark.
+
+        Raises:
+            KeyError: If `watermark_column` is not in the result.
+            SQLAlchemyError: If there is an error executing the query.
+        """
+        source = query_or_table.strip().rstrip(";")
+        if re.fullmatch(r'[\w$."]+', source):
+            source = f"SELECT * FROM {source}"
+        key = key or QueryCache.make_key(
+            self._split_queries(source),
+            {
+                "hook": type(self).__name__,
+                "database": self.database,
+                "schema": self.schema,
+                "watermark_column": watermark_column,
+            },
+        )
+        watermark = state_store.get(key, initial_value)
+
+        query = f"SELECT * FROM ({source}) AS jds_incremental"
+        parameters = None
+        if watermark is not None:
+            query = f"{query.replace('%', '%%')} WHERE {watermark_column} > %(watermark)s"
+            parameters = {"watermark": watermark}
+
+        try:
+            df = self.__fetch_frame(query, optimize_dtypes, parameters)
+        except SQLAlchemyError as e:
+            logging.error(f"Error trying to fetch incremental data from Snowflake. Details: {e}")
+            raise
+
+        if not df.empty:
+            column = next(
+                (c for c in df.columns if str(c).lower() == watermark_column.lower()), None
+            )
+            if column is None:
+                raise KeyError(f"Watermark column {watermark_column} not found in the result.")
+            new_watermark = df[column].max()
+            # Rows with a NULL watermark only must not reset the extract to a full reload
+            if not pd.isna(new_watermark):
+                state_store.set(key, new_watermark)
+        logging.info(
+            f"{len(df)} new rows fetched from Snowflake (previous watermark: {watermark})."
+        )
+        return df
+
+    def fetch_partitioned(
+        self,
+        query: str,
+        partition_column: str,
+        num_partitions: int,
+        *,
+        strategy: Literal["hash", "range"] = "hash",
+        max_workers: Optional[int] = None,
+        concat: bool = True,
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        """
+        Fetch data from Snowflake with several concurrent partitioned queries.
+
+        The query is wrapped into `num_partitions` queries, each one bounded to a disjoint slice
+        of `partition_column`, and they run concurrently over pooled connections. Workers beyond
+        the size of the engine connection pool open overflow connections.
+
+        With the "hash" strategy rows are assigned by `MOD(ABS(HASH(column)), num_partitions)`,
+        which works for any column type. With the "range" strategy the `MIN`/`MAX` of a numeric
+        column are fetched first and split into equal-width ranges. Other column types, such as
+        dates or strings, must use the "hash" strategy.
+
+        Args:
+            query (str): The SQL query to execute.
+            partition_column (str): The column or expression used to partition the result.
+            num_partitions (int): The number of partitioned queries.
+            strategy (Literal["hash", "range"], optional): How rows are assigned to partitions.
+                Defaults to "hash".
+            max_workers (Optional[int], optional): The maximum number of concurrent queries.
+                Defaults to None, which runs every partition at once.
+            concat (bool, optional): Whether to concatenate the partitions into one DataFrame.
+                When False an iterator yielding each partition as it completes is returned.
+                Defaults to True.
+
+        Returns:
+            Union[pd.DataFrame, Iterator[pd.DataFrame]]: The fetched data.
+
+        Raises:
+            ValueError: If `num_partitions` is not a positive integer, or if the "range" strategy
+                is used on a column that is not numeric.
+            SQLAlchemyError: If there is an error executing any of the queries.
+        """
+        if num_partitions <= 0:
+            raise ValueError("num_partitions must be a positive integer.")
+        query = query.strip().rstrip(";")
+        base = f"SELECT * FROM ({query}) AS jds_partition WHERE "
+
+        if strategy == "range":
+            bounds = self.__fetch_frame(
+                f"SELECT MIN({partition_column}), MAX({partition_column}) FROM ({query})"
+            ).iloc[0]
+            low, high = bounds.iloc[0], bounds.iloc[1]
+            if pd.isna(low):
+                queries = [f"SELECT * FROM ({query})"]
+            elif not all(
+                isinstance(edge, numbers.Number) and not isinstance(edge, bool)
+                for edge in (low, high)
+            ):
+                # The edges are written as plain SQL literals, which only holds for numbers
+                raise ValueError(
+                    f"The range strategy needs a numeric partition column, got {low!r} for "
+                    f"{partition_column}. Use strategy='hash' instead."
+                )
+            else:
+                step = (high - low) / num_partitions
+                edges = [low + step * i for i in range(num_partitions)] + [high]
+                queries = [
+                    base
+                    + f"({partition_column} >= {edges[i]} AND {partition_column} "
+                    + ("<=" if i == num_partitions - 1 else "<")
+                    + f" {edges[i + 1]})"
+                    + (f" OR {partition_column} IS NULL" if i == 0 else "")
+                    for i in range(num_partitions)
+                ]
+        else:
+            queries = [
+                base + f"MOD(ABS(HASH({partition_column})), {num_partitions}) = {i}"
+                for i in range(num_partitions)
+            ]
+
+        max_workers = max_workers or len(queries)
+        self.__ensure_pool_size(max_workers)
+
+        def iter_partitions() -> Iterator[pd.DataFrame]:
+            with ThreadPoolExecutor(max_workers) as executor:
+                futures = [executor.submit(self.__fetch_frame, q) for q in queries]
+                try:
+                    for future in as_completed(futures):
+                        yield future.result()
+                finally:
+                    for future in futures:
+                        future.cancel()
+            logging.info(f"Data fetched from Snowflake in {len(queries)} partitions.")
+
+        if not concat:
+            return iter_partitions()
+        try:
+            return pd.concat(list(iter_partitions()), ignore_index=True)
+        except SQLAlchemyError as e:
+            logging.error(f"Error trying to fetch partitioned data from Snowflake. Details: {e}")
+            raise
+
+    def fetch_arrow(
+        self,
+        query: str,
+        *,
+        as_dataframe: bool = False,
+        combine_chunks: bool = False,
+    ) -> Union["pa.Table", pd.DataFrame]:
+        """
+        Fetch data from Snowflake as Arrow.
+
+        This method executes the given SQL query on a raw connector cursor and collects the
+        connector's Arrow result batches, so no per-row Python objects are created. By default
+        the batches are concatenated without copying, producing a chunked `pyarrow.Table`.
+
+        Args:
+            query (str): The SQL query to execute.
+            as_dataframe (bool, optional): Whether to return an Arrow-backed pandas DataFrame
+                instead of a `pyarrow.Table`. Defaults to False.
+            combine_chunks (bool, optional): Whether to copy the batches into contiguous
+                arrays. Defaults to False, which keeps the zero-copy chunked layout.
+
+        Returns:
+            Union[pa.Table, pd.DataFrame]: The fetched data.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+            SnowflakeError: If there is an error executing the query.
+        """
+        if pa is None:
+            raise ImportError(
+                "pyarrow is required to fetch Arrow data. Install it with `pip install jds_tools[arrow]`."
+            )
+        with self._span("fetch_arrow", query) as span:
+            with span.phase("connect"):
+                connection = self.engine.raw_connection()
+            try:
+                cursor = connection.cursor()
+                try:
+                    with span.phase("execute"):
+                        cursor.execute(query)
+                    span.query_id = getattr(cursor, "sfqid", None)
+                    with span.phase("fetch"):
+                        tables = list(cursor.fetch_arrow_batches())
+                        if tables:
+                            table = pa.concat_tables(tables)
+                        else:
+                            table = pa.table(
+                                {column[0]: pa.array([]) for column in cursor.description}
+                            )
+                finally:
+                    cursor.close()
+            except SnowflakeError as e:
+                logging.error(f"Error trying to fetch Arrow data from Snowflake. Details: {e}")
+                raise
+            finally:
+                connection.close()
+            logging.info("Arrow data fetched from Snowflake.")
+            with span.phase("build"):
+                if combine_chunks:
+                    table = table.combine_chunks()
+                if as_dataframe:
+                    table = table.to_pandas(types_mapper=pd.ArrowDtype)
+            span.rows = len(table)
+            span.bytes = table.nbytes if not as_dataframe else int(table.memory_usage().sum())
+        return table
+
+    def fetch_batches(
+        self, query: str, batch_size: int = 100000, *, optimize_dtypes: bool = False
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Fetch data from Snowflake in batches.
+
+        This method executes the given SQL query and yields the result as pandas DataFrames of
+        at most `batch_size` rows. The Snowflake dialect has no server-side cursors, but the
+        connector downloads the result in chunks as the rows are fetched, so peak memory is
+        bounded by the batch size and the connector's chunks rather than by the size of the
+        result. The connection is only held open while the generator is being consumed and is
+        released once it is exhausted or closed.
+
+        Args:
+            query (str): The SQL query to execute.
+            batch_size (int, optional): The maximum number of rows in each DataFrame.
+                Defaults to 100000.
+            optimize_dtypes (bool, optional): Whether to convert the columns of each batch to
+                memory efficient dtypes driven by the cursor column metadata. Every batch gets
+                the same dtypes, the text columns keep the ones chosen for the first batch.
+                Defaults to False.
+
+        Yields:
+            pd.DataFrame: The next batch of fetched rows.
+
+        Raises:
+            ValueError: If `batch_size` is not a positive integer.
+            SQLAlchemyError: If there is an error executing the query.
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be a positive integer.")
+        try:
+            with self._span("fetch_batches", query) as span:
+                span.rows, span.bytes = 0, 0
+                with span.phase("connect"):
+                    connection = self.engine.connect()
+                with connection as connection:
+                    with span.phase("execute"):
+                        result = connection.execute(query)
+                    span.query_id = _query_id(result)
+                    columns = list(result.keys())
+                    if optimize_dtypes:
+                        column_types = dict(zip(columns, _column_types(result.cursor.description)))
+                    while True:
+                        with span.phase("fetch"):
+                            rows = result.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        with span.phase("build"):
+                            if optimize_dtypes:
+                                df = frame_from_rows(rows, columns)
+                                df = optimize_frame_dtypes(df, column_types)
+                                # Later batches keep the text dtypes chosen for the first one
+                                column_types = pin_text_dtypes(df, column_types)
+                            else:
+                                df = pd.DataFrame(rows, columns=columns)
+                        span.rows += len(df)
+                        span.bytes += int(df.memory_usage(index=False).sum())
+                        yield df
+            logging.info("Data fetched from Snowflake in batches.")
+        except SQLAlchemyError as e:
+            logging.error(f"Error trying to fetch data from Snowflake. Details: {e}")
+            raise
+
     def upload_data(
         self,
         data: pd.DataFrame,
@@ -243,30 +954,85 @@ class SnowflakeHook(DataHook):
         schema: str = None,
         if_exists_method: Literal["fail", "replace", "append"] = "append",
         chunk_size: int = 7500,
+        *,
+        method: Literal["insert", "copy"] = "insert",
+        file_format: Literal["parquet", "csv"] = "parquet",
+        num_partitions: Optional[int] = None,
+        target_file_size: int = 100 * 1024**2,
+        max_workers: Optional[int] = None,
     ):
         """
         Upload data to Snowflake.
 
         This method uploads the given pandas DataFrame to the specified table in Snowflake.
 
+        With `method="insert"` the data is written through `DataFrame.to_sql` in batched
+        INSERT statements. With `method="copy"` the data is serialised to a compressed file,
+        PUT to a temporary stage and loaded with a single `COPY INTO`, which is much faster
+        for large frames. Large frames are split into several files that are serialised and
+        uploaded concurrently, so Snowflake can also parallelise the COPY.
+
         Args:
             data (pd.DataFrame): The data to upload as a pandas DataFrame.
             table_name (str): The name of the table to upload the data to.
             if_exists_method (Literal["fail", "replace", "append"], optional): The method to handle
                 the case when the table already exists. Defaults to "append".
-            chunk_size (int, optional): The number of rows to insert in each batch. Defaults to 7500.
+            chunk_size (int, optional): The number of rows to insert in each batch. Only used by
+                the "insert" method. Defaults to 7500.
+            method (Literal["insert", "copy"], optional): The upload strategy. Defaults to "insert".
+            file_format (Literal["parquet", "csv"], optional): The staged file format used by the
+                "copy" method. Defaults to "parquet".
+            num_partitions (Optional[int], optional): The number of files the "copy" method splits
+                the data into. Defaults to None, which derives it from `target_file_size`.
+            target_file_size (int, optional): The approximate in-memory size in bytes of each
+                partition when `num_partitions` is not given. Defaults to 100 MiB.
+            max_workers (Optional[int], optional): The maximum number of threads serialising
+                and of threads uploading files. Defaults to None, which uses the default size of
+                a `ThreadPoolExecutor`.
 
         """
         schema = schema or self.schema or ""
+        target = f"{schema}.{table_name}" if schema else table_name
         try:
-            data.to_sql(
-                table_name,
-                self.engine,
-                schema=schema,
-                if_exists=if_exists_method,
-                index=False,
-                chunksize=chunk_size,
-            )
+            with self._span("upload", f"{method.upper()} INTO {target}") as span:
+                span.rows = len(data)
+                span.bytes = int(data.memory_usage(index=False).sum())
+                if method == "copy":
+                    # An empty to_sql call creates, replaces or validates the table exactly as
+                    # the insert method would, so the `if_exists_method` semantics are kept.
+                    with span.phase("load"):
+                        data.iloc[:0].to_sql(
+                            table_name,
+                            self.engine,
+                            schema=schema,
+                            if_exists=if_exists_method,
+                            index=False,
+                        )
+                    with span.phase("connect"):
+                        connection = self.engine.raw_connection()
+                    try:
+                        with span.phase("load"):
+                            self.__copy_into_table(
+                                connection,
+                                data,
+                                self.__qualified_name(table_name, schema),
+                                file_format,
+                                num_partitions=num_partitions,
+                                target_file_size=target_file_size,
+                                max_workers=max_workers,
+                            )
+                    finally:
+                        connection.close()
+                else:
+                    with span.phase("load"):
+                        data.to_sql(
+                            table_name,
+                            self.engine,
+                            schema=schema,
+                            if_exists=if_exists_method,
+                            index=False,
+                            chunksize=chunk_size,
+                        )
             logging.info(f"Data uploaded to Snowflake ({self.database}.{schema}.{table_name}).")
         except Exception as e:
             logging.error(
@@ -274,14 +1040,395 @@ class SnowflakeHook(DataHook):
             )
             raise
 
+    def __qualified_name(self, table_name: str, schema: Optional[str] = None) -> str:
+        """Build a schema qualified identifier quoted the same way `to_sql` creates tables."""
+        preparer = self.engine.dialect.identifier_preparer
+        parts = [preparer.quote_schema(schema)] if schema else []
+        parts.append(preparer.quote(table_name))
+        return ".".join(parts)
+
+    def upsert_data(
+        self,
+        data: pd.DataFrame,
+        table_name: str,
+        key_columns: List[str],
+        schema: str = None,
+        *,
+        file_format: Literal["parquet", "csv"] = "parquet",
+        num_partitions: Optional[int] = None,
+        target_file_size: int = 100 * 1024**2,
+        max_workers: Optional[int] = None,
+    ) -> dict:
+        """
+        Upsert data into a Snowflake table.
+
+        This method bulk loads the given pandas DataFrame into a temporary table (see the "copy"
+        method of `upload_data`) and then issues a single set-based `MERGE` that updates the rows
+        whose key columns already exist in the target table and inserts the rest. The target
+        table is created from the frame if it does not exist. When the frame holds several rows
+        for the same key, the last one wins.
+
+        Args:
+            data (pd.DataFrame): The data to upsert as a pandas DataFrame.
+            table_name (str): The name of the target table.
+            key_columns (List[str]): The columns that identify a row.
+            schema (str, optional): The schema of the target table. Defaults to the hook schema.
+            file_format (Literal["parquet", "csv"], optional): The staged file format.
+                Defaults to "parquet".
+            num_partitions (Optional[int], optional): The number of staged files. Defaults to None.
+            target_file_size (int, optional): The approximate in-memory size in bytes of each
+                staged file when `num_partitions` is not given. Defaults to 100 MiB.
+            max_workers (Optional[int], optional): The maximum number of threads serialising
+                and of threads uploading files. Defaults to None.
+
+        Raises:
+            ValueError: If no key columns are given or some of them are not in the data.
+
+        Returns:
+            dict: The number of rows "inserted" and "updated" by the MERGE.
+        """
+        if not key_columns:
+            raise ValueError("At least one key column is required to upsert data.")
+        missing_columns = [column for column in key_columns if column not in data.columns]
+        if missing_columns:
+            raise ValueError(f"Key columns not found in data: {missing_columns}")
+
+        schema = schema or self.schema or ""
+        data = data.drop_duplicates(subset=key_columns, keep="last")
+        preparer = self.engine.dialect.identifier_preparer
+        target = self.__qualified_name(table_name, schema)
+        staging = self.__qualified_name(f"jds_tools_tmp_{uuid.uuid4().hex}", schema)
+
+        columns = [preparer.quote(str(column)) for column in data.columns]
+        keys = [preparer.quote(str(column)) for column in key_columns]
+        on_clause = " AND ".join(f"t.{key} = s.{key}" for key in keys)
+        update_clause = ", ".join(f"t.{c} = s.{c}" for c in columns if c not in keys)
+        merge = (
+            f"MERGE INTO {target} AS t USING {staging} AS s ON {on_clause} "
+            + (f"WHEN MATCHED THEN UPDATE SET {update_clause} " if update_clause else "")
+            + f"WHEN NOT MATCHED THEN INSERT ({', '.join(columns)}) "
+            + f"VALUES ({', '.join(f's.{c}' for c in columns)})"
+        )
+
+        try:
+            with self._span("upsert", f"MERGE INTO {target}") as span:
+                span.rows = len(data)
+                span.bytes = int(data.memory_usage(index=False).sum())
+                with span.phase("load"):
+                    data.iloc[:0].to_sql(
+                        table_name, self.engine, schema=schema, if_exists="append", index=False
+                    )
+                with span.phase("connect"):
+                    connection = self.engine.raw_connection()
+                try:
+                    cursor = connection.cursor()
+                    try:
+                        with span.phase("load"):
+                            cursor.execute(f"CREATE TEMPORARY TABLE {staging} LIKE {target}")
+                        try:
+                            with span.phase("load"):
+                                self.__copy_into_table(
+                                    connection,
+                                    data,
+                                    staging,
+                                    file_format,
+                                    num_partitions=num_partitions,
+                                    target_file_size=target_file_size,
+                                    max_workers=max_workers,
+                                )
+                            with span.phase("merge"):
+                                cursor.execute(merge)
+                                counts = cursor.fetchone() or ()
+                            span.query_id = getattr(cursor, "sfqid", None)
+                        finally:
+                            # The session goes back to the pool, so the table would outlive
+                            # the call
+                            cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+                    finally:
+                        cursor.close()
+                finally:
+                    connection.close()
+            logging.info(f"Data upserted to Snowflake ({self.database}.{schema}.{table_name}).")
+        except Exception as e:
+            logging.error(
+                f"Error trying to upsert data to Snowflake ({self.database}.{schema}.{table_name}). Details: {e}"
+            )
+            raise
+
+        inserted = counts[0] if len(counts) > 0 else 0
+        updated = counts[1] if len(counts) > 1 else 0
+        return {"inserted": inserted, "updated": updated}
+
+    def __copy_into_table(
+        self,
+        connection,
+        data: pd.DataFrame,
+        qualified_table: str,
+        file_format: str,
+        *,
+        num_partitions: Optional[int] = None,
+        target_file_size: int = 100 * 1024**2,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        """
+        Load a DataFrame into an existing table through a temporary stage.
+
+        The frame is split into row partitions that are serialised in a thread pool and PUT
+        to the stage from another one as soon as each file is ready. All the files are then
+        loaded with a single `COPY INTO`. Threads share the partitions without pickling them
+        and pyarrow releases the GIL while it encodes and compresses Parquet files, while a
+        forked process pool could deadlock on the locks held by the connector threads.
+
+        Args:
+            connection: The raw DBAPI connection to load the data with. Temporary objects are
+                session scoped, so the stage is created on this connection.
+            data (pd.DataFrame): The data to load.
+            qualified_table (str): The quoted, schema qualified target table.
+            file_format (str): The staged file format, either "parquet" or "csv".
+            num_partitions (Optional[int], optional): The number of files to write.
+            target_file_size (int, optional): The approximate size in bytes of each partition.
+            max_workers (Optional[int], optional): The maximum number of workers of each pool.
+
+        """
+        if num_partitions is None:
+            num_partitions = math.ceil(data.memory_usage(deep=True).sum() / target_file_size)
+        num_partitions = max(1, min(num_partitions, len(data)))
+        bounds = [len(data) * i // num_partitions for i in range(num_partitions + 1)]
+
+        stage = f"JDS_TOOLS_STAGE_{uuid.uuid4().hex.upper()}"
+        if file_format == "parquet":
+            copy_options = "FILE_FORMAT = (TYPE = PARQUET) MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE"
+        else:
+            preparer = self.engine.dialect.identifier_preparer
+            columns = ", ".join(preparer.quote(str(column)) for column in data.columns)
+            qualified_table = f"{qualified_table} ({columns})"
+            copy_options = (
+                "FILE_FORMAT = (TYPE = CSV COMPRESSION = GZIP FIELD_OPTIONALLY_ENCLOSED_BY = '\"' "
+                "EMPTY_FIELD_AS_NULL = TRUE)"
+            )
+
+        def put_file(connection, path: str) -> None:
+            # Snowflake connections are thread safe, each upload only needs its own cursor
+            cursor = connection.cursor()
+            try:
+                cursor.execute(
+                    f"PUT '{Path(path).as_uri()}' @{stage} AUTO_COMPRESS = FALSE OVERWRITE = TRUE"
+                )
+            finally:
+                cursor.close()
+
+        with tempfile.TemporaryDirectory(prefix="jds_tools_") as tmp_dir:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(f"CREATE TEMPORARY STAGE {stage}")
+                try:
+                    partitions = (
+                        (data.iloc[start:stop], os.path.join(tmp_dir, f"part_{i}"), file_format)
+                        for i, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:]))
+                    )
+                    if num_partitions == 1:
+                        put_file(connection, _write_stage_file(*next(partitions)))
+                    else:
+                        writers = ThreadPoolExecutor(max_workers)
+                        uploaders = ThreadPoolExecutor(max_workers)
+                        with writers, uploaders:
+                            written = [writers.submit(_write_stage_file, *p) for p in partitions]
+                            uploads = [
+                                uploaders.submit(put_file, connection, future.result())
+                                for future in as_completed(written)
+                            ]
+                            for upload in uploads:
+                                upload.result()
+                    cursor.execute(
+                        f"COPY INTO {qualified_table} FROM @{stage} {copy_options} PURGE = TRUE"
+                    )
+                finally:
+                    # The session goes back to the pool, so the stage would outlive the call
+                    cursor.execute(f"DROP STAGE IF EXISTS {stage}")
+            finally:
+                cursor.close()
+        logging.info(f"{num_partitions} file(s) loaded into {qualified_table} through {stage}.")
+
+    async def afetch_data(self, query: str, *, poll_interval: float = 0.1) -> pd.DataFrame:
+        """
+        Asynchronously fetch data from Snowflake.
+
+        The query is submitted with the connector's asynchronous execution and its status is
+        polled without blocking the event loop, so many queries can be in flight at once. The
+        short blocking driver calls run on a bounded thread pool and pooled connections are
+        only held while those calls run, not for the duration of the query. If the coroutine
+        is cancelled, the query is also cancelled on Snowflake.
+
+        Args:
+            query (str): The SQL query to execute.
+            poll_interval (float, optional): The initial number of seconds between status
+                checks. It doubles on every check, up to 5 seconds. Defaults to 0.1.
+
+        Returns:
+            pd.DataFrame: The fetched data as a pandas DataFrame.
+
+        Raises:
+            SnowflakeError: If there is an error executing the query.
+
+        Example:
+            results = await asyncio.gather(*(hook.afetch_data(q) for q in queries))
+        """
+        try:
+            with self._span("afetch", query) as span:
+                span.query_id = await self.__await_query(query, poll_interval, span)
+                df = await self.__run_blocking(self.__fetch_query_results, span.query_id, span)
+                span.rows = len(df)
+                span.bytes = int(df.memory_usage(index=False).sum())
+        except SnowflakeError as e:
+            logging.error(f"Error trying to fetch data from Snowflake. Details: {e}")
+            raise
+        logging.info("Data fetched from Snowflake.")
+        return df
+
+    async def aexecute_statement(self, query: str, *, poll_interval: float = 0.1) -> None:
+        """
+        Asynchronously execute the given SQL query or queries on the Snowflake database.
+
+        The statements of the script run one after another on a single pooled connection, each
+        one submitted and awaited as in `afetch_data`. Since they share a Snowflake session,
+        `USE ...` statements, session variables and temporary tables carry over to the next
+        statements. The connection is held until the script finishes.
+
+        Args:
+            query (str): The SQL query or queries to execute. Multiple queries should be
+                separated by ';'.
+            poll_interval (float, optional): The initial number of seconds between status
+                checks. Defaults to 0.1.
+
+        Raises:
+            SnowflakeError: If there is an error executing the query.
+        """
+        connection = None
+        try:
+            for q in self._iter_queries(query):
+                with self._span("aexecute", q) as span:
+                    if connection is None:
+                        # The first statement checks out the connection the script runs on
+                        with span.phase("connect"):
+                            connection = await self.__run_blocking(
+                                lambda: self.engine.raw_connection()
+                            )
+                    span.query_id = await self.__await_query(q, poll_interval, span, connection)
+        except SnowflakeError as e:
+            logging.error(f"Error trying to execute query on Snowflake. Details: {e}")
+            raise
+        finally:
+            if connection is not None:
+                await asyncio.shield(self.__run_blocking(connection.close))
+        logging.info("Query executed successfully on Snowflake.")
+
+    async def __run_blocking(self, function, *args):
+        """Run a blocking driver call on the bounded async executor."""
+        if self.__async_executor is None:
+            self.__ensure_pool_size(self._async_max_workers)
+            self.__async_executor = ThreadPoolExecutor(
+                self._async_max_workers, thread_name_prefix="jds_tools_snowflake"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__async_executor, functools.partial(function, *args))
+
+    async def __await_query(
+        self, query: str, poll_interval: float, span: QuerySpan, connection=None
+    ) -> str:
+        """
+        Submit a query asynchronously and wait until it finishes, returning its query id.
+
+        The query runs on the given raw connection, or on any pooled one when it is None. The
+        connection checkouts are recorded in the "connect" phase of the span and the rest in
+        its "execute" phase.
+        """
+        submission = asyncio.ensure_future(
+            self.__run_blocking(self.__submit_query, query, span, connection)
+        )
+        query_id = None
+        try:
+            # Shielded, so a query cancelled while being submitted still gets its id to cancel
+            query_id = await asyncio.shield(submission)
+            while await self.__run_blocking(self.__is_query_running, query_id, span, connection):
+                with span.phase("execute"):
+                    await asyncio.sleep(poll_interval)
+                poll_interval = min(poll_interval * 2, 5)
+        except asyncio.CancelledError:
+            if query_id is None:
+                query_id = await submission
+            logging.info(f"Cancelling Snowflake query {query_id}.")
+            await asyncio.shield(self.__run_blocking(self.__cancel_query, query_id))
+            raise
+        return query_id
+
+    @contextmanager
+    def __raw_connection(self, span: QuerySpan, connection=None):
+        """
+        Yield the given raw connection, or check out a pooled one, timed as the "connect"
+        phase of the span, and release it after.
+        """
+        if connection is not None:
+            yield connection
+            return
+        with span.phase("connect"):
+            connection = self.engine.raw_connection()
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def __submit_query(self, query: str, span: QuerySpan, connection=None) -> str:
+        with self.__raw_connection(span, connection) as connection:
+            cursor = connection.cursor()
+            try:
+                with span.phase("execute"):
+                    cursor.execute_async(query)
+                return cursor.sfqid
+            finally:
+                cursor.close()
+
+    def __is_query_running(self, query_id: str, span: QuerySpan, connection=None) -> bool:
+        with self.__raw_connection(span, connection) as connection:
+            with span.phase("execute"):
+                snowflake_connection = connection.dbapi_connection
+                status = snowflake_connection.get_query_status_throw_if_error(query_id)
+                return snowflake_connection.is_still_running(status)
+
+    def __fetch_query_results(self, query_id: str, span: QuerySpan) -> pd.DataFrame:
+        with self.__raw_connection(span) as connection:
+            cursor = connection.cursor()
+            try:
+                with span.phase("fetch"):
+                    cursor.get_results_from_sfqid(query_id)
+                    rows = cursor.fetchall()
+                with span.phase("build"):
+                    return pd.DataFrame(rows, columns=[column[0] for column in cursor.description])
+            finally:
+                cursor.close()
+
+    def __cancel_query(self, query_id: str) -> None:
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(f"SELECT SYSTEM$CANCEL_QUERY('{query_id}')")
+            finally:
+                cursor.close()
+        finally:
+            connection.close()
+
     def dispose_engine(self) -> None:
         """
         Dispose the Snowflake connection engine.
 
-        This method disposes the SQLAlchemy engine object for the Snowflake connection.
+        This method disposes the SQLAlchemy engine object for the Snowflake connection and
+        shuts down the threads of the async API, which are started again on their next use.
 
         """
+        executor, self.__async_executor = self.__async_executor, None
+        if executor is not None:
+            executor.shutdown()
         try:
-            self.engine.dispose()
+            self._engine.dispose()
         except:
             pass
@@ -0,0 +1,388 @@
+import logging
+import uuid
+from typing import Iterator, List, Literal, Optional, Union
+
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import StaticPool
+
+from ..utils.dtypes import (
+    ColumnType,
+    frame_from_rows,
+    infer_column_types,
+    optimize_dtypes as optimize_frame_dtypes,
+    pin_text_dtypes,
+)
+from ..utils.instrumentation import Instrumentation
+from ..utils.query_cache import QueryCache
+from .base import DataHook
+
+# Set up the logger
+logger = logging.getLogger(__name__)
+
+
+class SQLiteHook(DataHook):
+    """
+    A class representing a local SQLite connection hook.
+
+    This class exposes the same API as `SnowflakeHook` (`fetch_data`, `fetch_batches`,
+    `export`, `execute_statement`, `upload_data` and `upsert_data`) on top of a local SQLite
+    database, so the same job code can run, be tested and be profiled offline, without a
+    warehouse or a network.
+
+    Args:
+        database (str, optional): The path of the SQLite database file. Defaults to ":memory:",
+            an in-memory database shared by every call of the hook.
+        cache (Optional[QueryCache], optional): The cache used by `fetch_data`. Defaults to None.
+        instrumentation (Optional[Instrumentation], optional): Receives a span with the timing
+            and row count of every statement. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        database: str = ":memory:",
+        cache: Optional[QueryCache] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ) -> None:
+        """
+        Initializes a SQLiteHook object.
+
+        Args:
+            database (str): The path of the SQLite database file. Defaults to ":memory:".
+            cache (Optional[QueryCache]): The result cache used by `fetch_data`. Defaults to None,
+                which disables caching.
+            instrumentation (Optional[Instrumentation]): Receives a `QuerySpan` per statement.
+                Defaults to None, which disables instrumentation.
+        """
+        self._database = database
+        self.cache = cache
+        self.instrumentation = instrumentation
+        self._engine: Optional[Engine] = None
+
+    @property
+    def database(self) -> str:
+        return self._database
+
+    @property
+    def engine(self) -> Engine:
+        """
+        Get the SQLite connection engine, creating it on first use.
+
+        Returns:
+            Engine: The SQLAlchemy engine object for the SQLite connection.
+        """
+        if self._engine is None:
+            if self.database == ":memory:":
+                # A single shared connection, otherwise every connection gets its own database
+                self._engine = create_engine(
+                    "sqlite://",
+                    poolclass=StaticPool,
+                    connect_args={"check_same_thread": False},
+                )
+            else:
+                self._engine = create_engine(f"sqlite:///{self.database}")
+        return self._engine
+
+    @engine.setter
+    def engine(self, value: Optional[Engine]) -> None:
+        self._engine = value
+
+    def _cache_context(self) -> dict:
+        return {"database": self.database}
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the SQLiteHook object.
+
+        Returns:
+            str: A string representation of the SQLiteHook object.
+        """
+        return f"SQLiteHook(database='{self.database}')"
+
+    def execute_statement(
+        self, query: Union[str, List[str]], *, max_workers: Optional[int] = None
+    ) -> None:
+        """
+        Executes the given SQL query or queries on the SQLite database.
+
+        SQLite serialises writes, so the statements always run in order on a single connection.
+        `max_workers` is accepted for compatibility with `SnowflakeHook.execute_statement`.
+
+        Args:
+            query (Union[str, List[str]]): The SQL query or queries to execute. Multiple queries
+                should be separated by ';'. A list of scripts is run group by group.
+            max_workers (Optional[int], optional): Ignored. Defaults to None.
+
+        Raises:
+            SQLAlchemyError: If there is an error executing the query.
+        """
+        groups = [query] if isinstance(query, str) else query
+        try:
+            with self.engine.begin() as connection:
+                for group in groups:
+                    for q in self._iter_queries(group):
+                        with self._span("execute", q) as span:
+                            with span.phase("execute"):
+                                result = connection.exec_driver_sql(q)
+                            # The DB-API rowcount is -1 when the driver does not know it
+                            rowcount = getattr(result, "rowcount", -1)
+                            span.rows = (
+                                rowcount if isinstance(rowcount, int) and rowcount >= 0 else None
+                            )
+            logging.info("Query executed successfully on SQLite.")
+        except SQLAlchemyError as e:
+            logging.error(f"Error trying to execute query on SQLite. Details: {e}")
+            raise
+
+    def fetch_data(
+        self,
+        query: str,
+        data_return: bool = True,
+        use_cache: bool = True,
+        optimize_dtypes: bool = False,
+    ) -> Union[pd.DataFrame, None]:
+        """
+        Fetch data from SQLite.
+
+        Args:
+            query (str): The SQL query to execute.
+            data_return (bool, optional): Whether to return the fetched data as a DataFrame.
+                Defaults to True.
+            use_cache (bool, optional): Whether to serve and store the result through the hook
+                `cache`, when one is configured. Defaults to True.
+            optimize_dtypes (bool, optional): Whether to convert the columns to memory efficient
+                dtypes inferred from the values. Defaults to False.
+
+        Returns:
+            Union[pd.DataFrame, None]: The fetched data as a pandas DataFrame, or None if
+            `data_return` is set to False.
+        """
+        cache_key = None
+        if self.cache is not None and use_cache and data_return:
+            extra = {"optimize_dtypes": True} if optimize_dtypes else {}
+            cache_key = self._cache_key(query, **extra)
+            df = self.cache.get(cache_key)
+            if df is not None:
+                logging.info("Data fetched from the query cache.")
+                return df
+        try:
+            with self._span("fetch", query) as span:
+                with span.phase("connect"):
+                    connection = self.engine.connect()
+                with connection as connection:
+                    with span.phase("execute"):
+                        result = connection.exec_driver_sql(query)
+                    with span.phase("fetch"):
+                        rows = result.fetchall()
+                    columns = list(result.keys())
+                with span.phase("build"):
+                    df = pd.DataFrame(rows, columns=columns)
+                    if optimize_dtypes:
+                        df = optimize_frame_dtypes(df)
+                span.rows = len(df)
+                span.bytes = int(df.memory_usage(index=False).sum())
+            logging.info("Data fetched from SQLite.")
+            if cache_key is not None:
+                self.cache.set(cache_key, df)
+            return df if data_return else None
+        except SQLAlchemyError as e:
+            logging.error(f"Error trying to fetch data from SQLite. Details: {e}")
+            return pd.DataFrame() if data_return else None
+
+    def fetch_batches(
+        self, query: str, batch_size: int = 100000, *, optimize_dtypes: bool = False
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Fetch data from SQLite in batches.
+
+        Args:
+            query (str): The SQL query to execute.
+            batch_size (int, optional): The maximum number of rows in each DataFrame.
+                Defaults to 100000.
+            optimize_dtypes (bool, optional): Whether to convert the columns of each batch to
+                memory efficient dtypes. SQLite reports no column types, so the types are
+                inferred from the first batch and every batch gets the same dtypes.
+                Defaults to False.
+
+        Yields:
+            pd.DataFrame: The next batch of fetched rows.
+
+        Raises:
+            ValueError: If `batch_size` is not a positive integer.
+            SQLAlchemyError: If there is an error executing the query.
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be a positive integer.")
+        try:
+            with self._span("fetch_batches", query) as span:
+                span.rows, span.bytes = 0, 0
+                with span.phase("connect"):
+                    connection = self.engine.connect()
+                with connection as connection:
+                    with span.phase("execute"):
+                        result = connection.execution_options(stream_results=True).exec_driver_sql(
+                            query
+                        )
+                    columns = list(result.keys())
+                    column_types = None
+                    while True:
+                        with span.phase("fetch"):
+                            rows = result.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        with span.phase("build"):
+                            if optimize_dtypes:
+                                df = frame_from_rows(rows, columns)
+                                if column_types is None:
+                                    # SQLite integers are 64-bit, narrowing them by the values
+                                    # of each batch would give batches different dtypes
+                                    column_types = {
+                                        column: (
+                                            ColumnType("integer", precision=18)
+                                            if column_type.kind == "integer"
+                                            else column_type
+                                        )
+                                        for column, column_type in infer_column_types(df).items()
+                                    }
+                                df = optimize_frame_dtypes(df, column_types)
+                                column_types = pin_text_dtypes(df, column_types)
+                            else:
+                                df = pd.DataFrame(rows, columns=columns)
+                        span.rows += len(df)
+                        span.bytes += int(df.memory_usage(index=False).sum())
+                        yield df
+            logging.info("Data fetched from SQLite in batches.")
+        except SQLAlchemyError as e:
+            logging.error(f"Error trying to fetch data from SQLite. Details: {e}")
+            raise
+
+    def upload_data(
+        self,
+        data: pd.DataFrame,
+        table_name: str,
+        schema: str = None,
+        if_exists_method: Literal["fail", "replace", "append"] = "append",
+        chunk_size: int = 7500,
+        *,
+        method: Literal["insert", "copy"] = "insert",
+        **kwargs,
+    ) -> None:
+        """
+        Upload data to SQLite.
+
+        With `method="copy"` every row is inserted with a single `executemany` in one
+        transaction, the local counterpart of the staged bulk load of `SnowflakeHook`. The
+        bulk load tuning options of `SnowflakeHook.upload_data` are accepted and ignored.
+
+        Args:
+            data (pd.DataFrame): The data to upload as a pandas DataFrame.
+            table_name (str): The name of the table to upload the data to.
+            schema (str, optional): The attached database to upload to. Defaults to None.
+            if_exists_method (Literal["fail", "replace", "append"], optional): The method to handle
+                the case when the table already exists. Defaults to "append".
+            chunk_size (int, optional): The number of rows to insert in each batch. Only used by
+                the "insert" method. Defaults to 7500.
+            method (Literal["insert", "copy"], optional): The upload strategy. Defaults to "insert".
+        """
+        target = f"{schema}.{table_name}" if schema else table_name
+        try:
+            with self._span("upload", f"{method.upper()} INTO {target}") as span:
+                span.rows = len(data)
+                span.bytes = int(data.memory_usage(index=False).sum())
+                data.to_sql(
+                    table_name,
+                    self.engine,
+                    schema=schema,
+                    if_exists=if_exists_method,
+                    index=False,
+                    chunksize=None if method == "copy" else chunk_size,
+                )
+            logging.info(f"Data uploaded to SQLite ({self.database}.{table_name}).")
+        except Exception as e:
+            logging.error(
+                f"Error trying to upload data to SQLite ({self.database}.{table_name}). Details: {e}"
+            )
+            raise
+
+    def upsert_data(
+        self,
+        data: pd.DataFrame,
+        table_name: str,
+        key_columns: List[str],
+        schema: str = None,
+        **kwargs,
+    ) -> dict:
+        """
+        Upsert data into a SQLite table.
+
+        The frame is loaded into a scratch table and merged with a single
+        `INSERT ... ON CONFLICT DO UPDATE` statement. A unique index on the key columns is
+        created if needed. The target table is created from the frame if it does not exist.
+
+        Args:
+            data (pd.DataFrame): The data to upsert as a pandas DataFrame.
+            table_name (str): The name of the target table.
+            key_columns (List[str]): The columns that identify a row.
+            schema (str, optional): The attached database of the target table. Defaults to None.
+
+        Raises:
+            ValueError: If no key columns are given or some of them are not in the data.
+
+        Returns:
+            dict: The number of rows "inserted" and "updated".
+        """
+        if not key_columns:
+            raise ValueError("At least one key column is required to upsert data.")
+        missing_columns = [column for column in key_columns if column not in data.columns]
+        if missing_columns:
+            raise ValueError(f"Key columns not found in data: {missing_columns}")
+
+        data = data.drop_duplicates(subset=key_columns, keep="last")
+        quote = self.engine.dialect.identifier_preparer.quote
+        prefix = f"{quote(schema)}." if schema else ""
+        staging_name = f"jds_tools_tmp_{uuid.uuid4().hex}"
+        target, staging = f"{prefix}{quote(table_name)}", f"{prefix}{quote(staging_name)}"
+        columns = [quote(str(column)) for column in data.columns]
+        keys = [quote(str(column)) for column in key_columns]
+        index = quote(f"jds_tools_{table_name}_{'_'.join(map(str, key_columns))}_key")
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c not in keys)
+
+        try:
+            with self.engine.begin() as connection:
+                data.iloc[:0].to_sql(
+                    table_name, connection, schema=schema, if_exists="append", index=False
+                )
+                connection.exec_driver_sql(
+                    f"CREATE UNIQUE INDEX IF NOT EXISTS {prefix}{index} "
+                    f"ON {quote(table_name)} ({', '.join(keys)})"
+                )
+                data.to_sql(staging_name, connection, schema=schema, index=False)
+                updated = connection.exec_driver_sql(
+                    f"SELECT COUNT(*) FROM {staging} AS s JOIN {target} AS t ON "
+                    + " AND ".join(f"s.{key} = t.{key}" for key in keys)
+                ).scalar()
+                connection.exec_driver_sql(
+                    f"INSERT INTO {target} ({', '.join(columns)}) "
+                    f"SELECT {', '.join(columns)} FROM {staging} WHERE true "
+                    f"ON CONFLICT ({', '.join(keys)}) "
+                    + (f"DO UPDATE SET {updates}" if updates else "DO NOTHING")
+                )
+                connection.exec_driver_sql(f"DROP TABLE {staging}")
+            logging.info(f"Data upserted to SQLite ({self.database}.{table_name}).")
+        except Exception as e:
+            logging.error(
+                f"Error trying to upsert data to SQLite ({self.database}.{table_name}). Details: {e}"
+            )
+            raise
+        return {"inserted": len(data) - updated, "updated": updated}
+
+    def dispose_engine(self) -> None:
+        """
+        Dispose the SQLite connection engine.
+
+        """
+        if self._engine is not None:
+            self._engine.dispose()
+            self._engine = None
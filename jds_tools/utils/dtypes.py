@@ -0,0 +1,263 @@
+import logging
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Nullable integer dtypes, from the narrowest to the widest
+INTEGER_DTYPES = ("Int8", "Int16", "Int32", "Int64")
+
+# Maximum number of decimal digits held by each nullable integer dtype
+_INTEGER_DIGITS = (2, 4, 9, 18)
+
+try:
+    import pyarrow as pa
+
+    STRING_DTYPE = "string[pyarrow]"
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    STRING_DTYPE = "string"
+
+
+class ColumnType(NamedTuple):
+    """
+    The logical type of a result column, as reported by the cursor metadata.
+
+    Attributes:
+        kind (str): One of "integer", "decimal", "float", "text", "timestamp", "date",
+            "boolean" or "other". Text columns can also be pinned to "category" or "string".
+        precision (Optional[int]): The numeric precision, if any.
+        scale (Optional[int]): The numeric scale, if any.
+    """
+
+    kind: str
+    precision: Optional[int] = None
+    scale: Optional[int] = None
+
+
+def _infer_kind(series: pd.Series) -> str:
+    """Infer the logical type of a column from its values when no metadata is available."""
+    if pd.api.types.is_bool_dtype(series):
+        return "boolean"
+    if pd.api.types.is_integer_dtype(series):
+        return "integer"
+    if pd.api.types.is_float_dtype(series):
+        return "float"
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return "timestamp"
+    if series.dtype != object:
+        return "other"
+    inferred = pd.api.types.infer_dtype(series, skipna=True)
+    return {
+        "integer": "integer",
+        "decimal": "decimal",
+        "floating": "float",
+        "mixed-integer-float": "float",
+        "string": "text",
+        "datetime": "timestamp",
+        "datetime64": "timestamp",
+        "date": "date",
+        "boolean": "boolean",
+    }.get(inferred, "other")
+
+
+def infer_column_types(df: pd.DataFrame) -> Dict[str, ColumnType]:
+    """
+    Infer the logical type of every column from its values, for results without metadata.
+
+    Passing the types inferred from the first batch of a result to `optimize_dtypes` gives
+    the next batches the same kinds.
+
+    Args:
+        df (pd.DataFrame): The DataFrame, typically built with `frame_from_rows`.
+
+    Returns:
+        Dict[str, ColumnType]: The logical type of each column, by name.
+    """
+    return {column: ColumnType(_infer_kind(df.iloc[:, i])) for i, column in enumerate(df.columns)}
+
+
+def frame_from_rows(rows: Sequence[Sequence[Any]], columns: List[str]) -> pd.DataFrame:
+    """
+    Build a DataFrame of object columns holding the fetched values as they are.
+
+    `pd.DataFrame(rows)` turns integer columns with nulls into float64, which silently rounds
+    integers beyond 2**53, so the rows are transposed into object columns instead and left
+    for `optimize_dtypes` to convert exactly.
+
+    Args:
+        rows (Sequence[Sequence[Any]]): The fetched rows.
+        columns (List[str]): The column names.
+
+    Returns:
+        pd.DataFrame: The DataFrame, with an object column per name.
+    """
+    values = list(zip(*rows)) if rows else [()] * len(columns)
+    df = pd.DataFrame(
+        {position: pd.Series(column, dtype=object) for position, column in enumerate(values)},
+        index=pd.RangeIndex(len(rows)),
+    )
+    df.columns = columns
+    return df
+
+
+def _integer_dtype(precision: Optional[int]) -> Optional[str]:
+    """Get the narrowest nullable integer dtype holding every NUMBER(precision, 0) value."""
+    if precision is None:
+        return None
+    for dtype, digits in zip(INTEGER_DTYPES, _INTEGER_DIGITS):
+        if precision <= digits:
+            return dtype
+    # Wider numbers usually hold int64 values, the conversion fails on those that do not
+    return INTEGER_DTYPES[-1]
+
+
+def _to_integer(series: pd.Series, precision: Optional[int] = None) -> pd.Series:
+    """
+    Convert a column to a nullable integer dtype, without going through floats.
+
+    The dtype is taken from the metadata `precision`, so every batch of a result gets the same
+    one, or is the narrowest holding the values when the precision is unknown.
+
+    Raises:
+        TypeError: If a value is not an integer.
+        OverflowError: If a value does not fit in int64.
+    """
+    if series.dtype == object:
+        values = pd.array(series.to_numpy(), dtype=INTEGER_DTYPES[-1])
+    else:
+        values = series.array.astype(INTEGER_DTYPES[-1])
+    dtype = _integer_dtype(precision)
+    if dtype is None:
+        dtype = INTEGER_DTYPES[0]
+        if (~values.isna()).any():
+            low, high = values.min(), values.max()
+            dtype = next(
+                dtype
+                for dtype in INTEGER_DTYPES
+                if np.iinfo(dtype.lower()).min <= low and high <= np.iinfo(dtype.lower()).max
+            )
+    return pd.Series(values.astype(dtype), index=series.index, name=series.name)
+
+
+def _to_decimal(series: pd.Series, precision: Optional[int], scale: Optional[int]) -> pd.Series:
+    """
+    Convert a column of decimals to an exact Arrow decimal dtype.
+
+    Without pyarrow the values are kept as they are, since floats would round them.
+    """
+    if pa is None:
+        return series
+    if precision is not None and scale is not None:
+        dtype = pd.ArrowDtype(pa.decimal128(precision, scale))
+        return pd.Series(pd.array(series, dtype=dtype), index=series.index, name=series.name)
+    # Without metadata, the precision and scale are inferred from the values
+    array = pa.array(series.to_numpy(dtype=object), from_pandas=True)
+    return pd.Series(pd.arrays.ArrowExtensionArray(array), index=series.index, name=series.name)
+
+
+def _to_datetime(series: pd.Series) -> pd.Series:
+    try:
+        return pd.to_datetime(series)
+    except (ValueError, TypeError):
+        # Mixed UTC offsets can only be represented in a single timezone
+        return pd.to_datetime(series, utc=True)
+
+
+def optimize_dtypes(
+    df: pd.DataFrame,
+    column_types: Optional[Dict[str, ColumnType]] = None,
+    *,
+    category_threshold: float = 0.5,
+) -> pd.DataFrame:
+    """
+    Convert the columns of a DataFrame to memory efficient dtypes.
+
+    Query results usually come back as object columns holding Python values. This function
+    converts, column by column:
+
+    - Integer columns (e.g. NUMBER(p, 0)) to the narrowest nullable integer dtype holding
+      every value of their precision, or their values when the precision is unknown.
+    - Decimal columns (e.g. NUMBER(p, s)) to exact Arrow decimals, when pyarrow is installed.
+    - Float columns to float64.
+    - Text columns to `category` when they have few distinct values, and to (Arrow-backed,
+      when pyarrow is installed) strings otherwise. Use `pin_text_dtypes` to keep the choice
+      made for a batch in the next ones.
+    - Timestamp and date columns to datetime64.
+    - Boolean columns to the nullable boolean dtype.
+
+    The logical type of each column is taken from `column_types` when given (typically built
+    from the cursor metadata) and inferred from the values otherwise. Values are
+    converted exactly, without going through floats, and columns that cannot be converted
+    are kept as they are. Build the DataFrame with `frame_from_rows`, so integers are not
+    rounded before.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to optimize.
+        column_types (Optional[Dict[str, ColumnType]], optional): The logical type of each
+            column. Defaults to None.
+        category_threshold (float, optional): The maximum ratio of distinct values to rows for
+            a text column to become a category. Defaults to 0.5.
+
+    Returns:
+        pd.DataFrame: A new DataFrame with the converted columns.
+    """
+    column_types = column_types or {}
+    result = df.copy(deep=False)
+    for position, column in enumerate(df.columns):
+        series = df.iloc[:, position]
+        column_type = column_types.get(column)
+        kind = column_type.kind if column_type else _infer_kind(series)
+        try:
+            precision = column_type.precision if column_type else None
+            scale = column_type.scale if column_type else None
+            if kind == "integer":
+                series = _to_integer(series, precision)
+            elif kind == "decimal":
+                series = _to_decimal(series, precision, scale)
+            elif kind == "float":
+                series = pd.to_numeric(series).astype("float64")
+            elif kind == "category":
+                series = series.astype("category")
+            elif kind == "string":
+                series = series.astype(STRING_DTYPE)
+            elif kind == "text":
+                non_null = series.count()
+                if non_null and series.nunique() / non_null <= category_threshold:
+                    series = series.astype("category")
+                else:
+                    series = series.astype(STRING_DTYPE)
+            elif kind in ("timestamp", "date"):
+                series = _to_datetime(series)
+            elif kind == "boolean":
+                series = series.astype("boolean")
+        except (ValueError, TypeError, OverflowError) as e:
+            logger.debug(f"Column {column} kept as {series.dtype}. Details: {e}")
+        result.isetitem(position, series)
+    return result
+
+
+def pin_text_dtypes(df: pd.DataFrame, column_types: Dict[str, ColumnType]) -> Dict[str, ColumnType]:
+    """
+    Pin the text columns to the dtype `optimize_dtypes` chose for them in a batch.
+
+    Whether a text column becomes a category depends on the values of each batch, so the
+    batches of a result would otherwise get different dtypes that `pd.concat` can only
+    combine as objects.
+
+    Args:
+        df (pd.DataFrame): A batch converted by `optimize_dtypes`.
+        column_types (Dict[str, ColumnType]): The logical types the batch was converted with.
+
+    Returns:
+        Dict[str, ColumnType]: The logical types, with "text" replaced by "category" or
+        "string".
+    """
+    pinned = dict(column_types)
+    for column, column_type in column_types.items():
+        if column_type.kind == "text" and column in df:
+            kind = "category" if isinstance(df[column].dtype, pd.CategoricalDtype) else "string"
+            pinned[column] = column_type._replace(kind=kind)
+    return pinned
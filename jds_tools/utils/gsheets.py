@@ -0,0 +1,430 @@
+import datetime
+import decimal
+import warnings
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from gspread.utils import (
+    DateTimeOption,
+    ValueRenderOption,
+    a1_range_to_grid_range,
+    rowcol_to_a1,
+)
+
+# Format of the datetimes written to Google Sheets, parsed back as dates when user entered
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+DATE_FORMAT = "%Y-%m-%d"
+
+_NANOSECONDS_PER_DAY = 86_400_000_000_000
+
+# Number of values a parser is tried on before it is applied to a whole column
+_INFERENCE_SAMPLE_SIZE = 100
+
+# Spellings of the booleans returned by the API, formatted ("TRUE") or not (True)
+_BOOLEANS = {True: True, False: False, "TRUE": True, "FALSE": False, "true": True, "false": False}
+
+
+def _cell_value(value: Any) -> Any:
+    """Convert a single value of an object column to a JSON serialisable cell value."""
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        return ""
+    if isinstance(value, (str, bool, int)):
+        return value
+    if isinstance(value, (float, np.floating)):
+        return float(value) if np.isfinite(value) else ""
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, decimal.Decimal):
+        return float(value) if value.is_finite() else ""
+    if isinstance(value, datetime.datetime):
+        return value.strftime(DATETIME_FORMAT)
+    if isinstance(value, datetime.date):
+        return value.strftime(DATE_FORMAT)
+    return str(value)
+
+
+def _format_datetimes(series: pd.Series) -> np.ndarray:
+    """
+    Format a datetime column as text, with numpy instead of a per value `strftime`.
+
+    Args:
+        series (pd.Series): The datetime column, naive or timezone aware.
+
+    Returns:
+        np.ndarray: The values formatted with `DATE_FORMAT` when every value is a date, or
+        with `DATETIME_FORMAT` otherwise. Missing values are left as "NaT".
+    """
+    if getattr(series.dtype, "tz", None) is not None:
+        series = series.dt.tz_localize(None)
+    values = series.to_numpy(dtype="datetime64[ns]")
+    present = ~np.isnat(values)
+    nanoseconds = values[present].view("i8")
+    if not (nanoseconds % _NANOSECONDS_PER_DAY).any():
+        return np.datetime_as_string(values, unit="D")
+    text = np.datetime_as_string(values, unit="s")
+    chars = text.view("U1").reshape(len(text), -1)
+    if chars.shape[1] > 10 and (chars[present, 10] == "T").all():
+        # Four digit years, "YYYY-MM-DDTHH:MM:SS": swap the separator instead of a string replace
+        chars = chars.copy()
+        chars[:, 10] = " "
+        return chars.view(text.dtype).ravel()
+    return np.char.replace(text, "T", " ")
+
+
+def _column_values(series: pd.Series) -> List[Any]:
+    """
+    Convert a column to a list of JSON serialisable cell values, with a vectorised path per dtype.
+
+    Missing values become empty strings, so the cells are left blank.
+
+    Args:
+        series (pd.Series): The column.
+
+    Returns:
+        List[Any]: The cell values, in order.
+    """
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        series = series.astype(dtype.categories.dtype if len(dtype.categories) else object)
+        dtype = series.dtype
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        values = _format_datetimes(series).astype(object)
+        values[series.isna().to_numpy()] = ""
+        return values.tolist()
+    if pd.api.types.is_timedelta64_dtype(dtype):
+        return series.astype(str).where(series.notna(), "").tolist()
+    if isinstance(dtype, np.dtype) and dtype.kind in "biu":
+        # Plain numpy bools and integers can not be missing, tolist returns Python scalars
+        return series.tolist()
+    if isinstance(dtype, np.dtype) and dtype.kind == "f":
+        array = series.to_numpy()
+        values = array.astype(object)
+        values[~np.isfinite(array)] = ""
+        return values.tolist()
+    if pd.api.types.is_extension_array_dtype(dtype) and (
+        pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype)
+    ):
+        # Nullable integers, floats and booleans
+        return series.to_numpy(dtype=object, na_value="").tolist()
+    if pd.api.types.is_string_dtype(dtype) and pd.api.types.infer_dtype(series) in (
+        "string",
+        "empty",
+    ):
+        return series.to_numpy(dtype=object, na_value="").tolist()
+    return [_cell_value(value) for value in series.to_numpy(dtype=object)]
+
+
+def frame_to_grid(
+    data: pd.DataFrame, include_headers: bool = True, include_index: bool = False
+) -> List[List[Any]]:
+    """
+    Convert a DataFrame to the rows of JSON serialisable values sent to Google Sheets.
+
+    The values are converted column by column with a vectorised path per dtype: missing
+    values and infinities become blank cells, datetimes are formatted as
+    "YYYY-MM-DD HH:MM:SS" (or "YYYY-MM-DD" when every value is a date) and decimals become
+    floats. The rows are then assembled with a single transposition.
+
+    Args:
+        data (pd.DataFrame): The data to convert.
+        include_headers (bool, optional): Whether to start with a row of column names.
+            Defaults to True.
+        include_index (bool, optional): Whether to start every row with the index value.
+            Defaults to False.
+
+    Returns:
+        List[List[Any]]: The rows of cell values.
+    """
+    columns = [_column_values(data.iloc[:, i]) for i in range(data.shape[1])]
+    headers = [_cell_value(column) for column in data.columns]
+    if include_index:
+        index = data.index.to_frame(index=False)
+        index_names = [_cell_value(name) for name in data.index.names]
+        columns = [_column_values(index.iloc[:, i]) for i in range(index.shape[1])] + columns
+        headers = index_names + headers
+    rows = [list(row) for row in zip(*columns)] if columns else [[] for _ in range(len(data))]
+    return [headers] + rows if include_headers else rows
+
+
+def iter_frame_grid(
+    data: pd.DataFrame,
+    rows_per_block: int,
+    include_headers: bool = True,
+    include_index: bool = False,
+) -> Iterator[List[List[Any]]]:
+    """
+    Convert a DataFrame to Google Sheets rows in blocks, so only one block is held in memory.
+
+    Args:
+        data (pd.DataFrame): The data to convert.
+        rows_per_block (int): The maximum number of rows in each block, the row of column
+            names included.
+        include_headers (bool, optional): Whether the first block starts with a row of column
+            names. Defaults to True.
+        include_index (bool, optional): Whether to start every row with the index value.
+            Defaults to False.
+
+    Yields:
+        List[List[Any]]: The rows of cell values of the next block.
+
+    Raises:
+        ValueError: If `rows_per_block` is not a positive integer.
+    """
+    if rows_per_block <= 0:
+        raise ValueError("rows_per_block must be a positive integer.")
+    # The first block always comes out, so an empty frame still writes its column names
+    start, stop = 0, rows_per_block - int(include_headers)
+    yield frame_to_grid(data.iloc[start:stop], include_headers, include_index)
+    for start in range(stop, len(data), rows_per_block):
+        yield frame_to_grid(data.iloc[start : start + rows_per_block], False, include_index)
+
+
+def iter_frame_blocks(
+    data: pd.DataFrame,
+    table_range: str,
+    chunk_cells: int,
+    include_headers: bool = True,
+    include_index: bool = False,
+) -> Iterator[Tuple[str, List[List[Any]]]]:
+    """
+    Convert a DataFrame to the blocks written with one request each, one block at a time.
+
+    The blocks are the ones `split_blocks` makes from the whole grid, but each one is only
+    converted when it is requested, so a block can be sent while the next one is converted.
+
+    Args:
+        data (pd.DataFrame): The data to convert.
+        table_range (str): The range written to, only its top left cell is used.
+        chunk_cells (int): The maximum number of cells of a block.
+        include_headers (bool, optional): Whether the first block starts with a row of column
+            names. Defaults to True.
+        include_index (bool, optional): Whether to start every row with the index value.
+            Defaults to False.
+
+    Yields:
+        Tuple[str, List[List[Any]]]: The A1 notation of the top left cell of the next block,
+        with its rows.
+    """
+    width = data.shape[1] + (data.index.nlevels if include_index else 0)
+    grid_range = a1_range_to_grid_range(table_range)
+    first_row = grid_range.get("startRowIndex", 0) + 1
+    first_column = grid_range.get("startColumnIndex", 0) + 1
+    rows_per_block = max(1, chunk_cells // max(width, 1))
+    offset = 0
+    for rows in iter_frame_grid(data, rows_per_block, include_headers, include_index):
+        yield rowcol_to_a1(first_row + offset, first_column), rows
+        offset += len(rows)
+
+
+def adapt_data_for_gsheets(
+    data: Union[List[List[Any]], pd.DataFrame, pd.Series],
+    include_headers: bool = True,
+    include_index: bool = False,
+) -> List[List[Any]]:
+    """
+    Convert the data written to Google Sheets to rows of cell values.
+
+    A Series is written as a single row and a DataFrame is converted with `frame_to_grid`.
+    Lists of rows are returned untouched.
+
+    Args:
+        data (Union[List[List[Any]], pd.DataFrame, pd.Series]): The data to write.
+        include_headers (bool, optional): Whether to start with a row of column names.
+            Defaults to True.
+        include_index (bool, optional): Whether to start every row with the index value.
+            Defaults to False.
+
+    Returns:
+        List[List[Any]]: The rows of cell values.
+    """
+    if isinstance(data, pd.Series):
+        data = data.to_frame().T
+    if isinstance(data, pd.DataFrame):
+        return frame_to_grid(data, include_headers, include_index)
+    return data
+
+
+def render_options(value_render_option: Optional[str]) -> Dict[str, Any]:
+    """
+    Get the render options of a read, keeping dates as text when values are unformatted.
+
+    Args:
+        value_render_option (Optional[str]): The value render option of the Sheets API, e.g.
+            "FORMATTED_VALUE", "UNFORMATTED_VALUE" or "FORMULA". None uses the API default.
+
+    Returns:
+        Dict[str, Any]: The `valueRenderOption` and, unless values are formatted, the
+        `dateTimeRenderOption`, as gspread enums.
+    """
+    if value_render_option is None:
+        return {}
+    options = {"valueRenderOption": ValueRenderOption(value_render_option)}
+    if options["valueRenderOption"] != ValueRenderOption.formatted:
+        # Dates would otherwise be returned as serial numbers
+        options["dateTimeRenderOption"] = DateTimeOption.formatted_string
+    return options
+
+
+def split_blocks(
+    values: List[List[Any]], table_range: str, chunk_cells: Optional[int]
+) -> List[Tuple[str, List[List[Any]]]]:
+    """
+    Split rows of cell values in blocks written with one request each.
+
+    Args:
+        values (List[List[Any]]): The rows of cell values.
+        table_range (str): The range written to, only its top left cell is used.
+        chunk_cells (Optional[int]): The maximum number of cells of a block. None writes a
+            single block.
+
+    Returns:
+        List[Tuple[str, List[List[Any]]]]: The A1 notation of the top left cell of each block,
+        with its rows.
+    """
+    width = max((len(row) for row in values), default=0)
+    if chunk_cells is None or not values or len(values) * width <= chunk_cells:
+        return [(table_range, values)]
+    grid_range = a1_range_to_grid_range(table_range)
+    first_row = grid_range.get("startRowIndex", 0) + 1
+    first_column = grid_range.get("startColumnIndex", 0) + 1
+    rows_per_block = max(1, chunk_cells // max(width, 1))
+    return [
+        (rowcol_to_a1(first_row + start, first_column), values[start : start + rows_per_block])
+        for start in range(0, len(values), rows_per_block)
+    ]
+
+
+def _parse_booleans(series: pd.Series) -> Optional[pd.Series]:
+    """Parse a column of booleans, or return None if some value is not a boolean."""
+    # 1 and 0 hash like True and False, so only booleans and strings are looked up
+    if pd.api.types.infer_dtype(series, skipna=True) not in ("boolean", "string"):
+        return None
+    parsed = series.map(_BOOLEANS)
+    if parsed.notna().sum() != series.notna().sum():
+        return None
+    return parsed.astype("boolean")
+
+
+def _parse_numbers(series: pd.Series) -> Optional[pd.Series]:
+    """Parse a column of numbers, or return None if some value is not a number."""
+    parsed = pd.to_numeric(series, errors="coerce")
+    if parsed.notna().sum() != series.notna().sum():
+        return None
+    present = parsed.dropna()
+    if not (present == present.round()).all():
+        return parsed.astype("float64")
+    # Whole floats such as "1.0" or 2.0 are still floats, only integer literals become Int64
+    literals = series.dropna().astype(str)
+    if not literals.str.fullmatch(r"\s*[+-]?\d+\s*").all():
+        return parsed.astype("float64")
+    return parsed.astype("Int64")
+
+
+def _parse_datetimes(series: pd.Series) -> Optional[pd.Series]:
+    """Parse a column of datetimes, or return None if some value is not a datetime."""
+    with warnings.catch_warnings():
+        # The format is inferred from the first value, pandas warns when it falls back
+        warnings.simplefilter("ignore", UserWarning)
+        parsed = pd.to_datetime(series, errors="coerce")
+    if parsed.notna().sum() != series.notna().sum():
+        return None
+    return parsed
+
+
+def _infer_column(series: pd.Series) -> pd.Series:
+    """
+    Parse a column of cell values into booleans, integers, floats or datetimes, in this order
+    of preference, falling back to strings.
+    """
+    sample = series.dropna().iloc[:_INFERENCE_SAMPLE_SIZE]
+    if sample.empty:
+        return series
+    for parse in (_parse_booleans, _parse_numbers, _parse_datetimes):
+        # Most columns are ruled out by a few values, without parsing every row
+        if parse(sample) is None:
+            continue
+        parsed = parse(series)
+        if parsed is not None:
+            return parsed
+    return series
+
+
+def _convert_column(series: pd.Series, dtype: Any) -> pd.Series:
+    """
+    Convert a column of cell values to the given dtype.
+
+    Raises:
+        ValueError: If a value can not be converted.
+    """
+    dtype = pd.api.types.pandas_dtype(dtype)
+    if pd.api.types.is_bool_dtype(dtype):
+        parsed = _parse_booleans(series)
+        if parsed is None:
+            raise ValueError(f"Column {series.name!r} has values that are not booleans.")
+        return parsed if isinstance(dtype, pd.BooleanDtype) else parsed.astype(dtype)
+    if pd.api.types.is_numeric_dtype(dtype):
+        return pd.to_numeric(series, errors="raise").astype(dtype)
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return pd.to_datetime(series, errors="raise").astype(dtype)
+    return series.astype(dtype)
+
+
+def grid_to_frame(
+    values: List[List[Any]],
+    has_headers: bool = True,
+    dtypes: Optional[Dict[str, Any]] = None,
+    infer_dtypes: bool = False,
+) -> pd.DataFrame:
+    """
+    Build a DataFrame from the rows of cell values read from Google Sheets.
+
+    Without `dtypes` and `infer_dtypes` every column keeps the cell values as returned by the
+    API. Otherwise the columns are parsed with vectorised pandas conversions and empty cells
+    become missing values.
+
+    Args:
+        values (List[List[Any]]): The rows of cell values, padded to the same length.
+        has_headers (bool, optional): Whether the first row holds the column names.
+            Defaults to True.
+        dtypes (Optional[Dict[str, Any]], optional): The dtype of some columns, by name, e.g.
+            {"id": "Int64", "price": "float64", "active": "boolean", "day": "datetime64[ns]"}.
+            Defaults to None.
+        infer_dtypes (bool, optional): Whether to parse the other columns into booleans,
+            integers, floats or datetimes when every value of the column allows it.
+            Defaults to False.
+
+    Returns:
+        pd.DataFrame: The data.
+
+    Raises:
+        ValueError: If a value can not be converted to the dtype of its column.
+    """
+    headers = values[0] if has_headers and values else None
+    rows = values[1:] if has_headers else values
+    if not dtypes and not infer_dtypes:
+        return pd.DataFrame(rows, columns=headers)
+
+    width = len(headers) if headers is not None else max((len(row) for row in rows), default=0)
+    grid = np.array(rows, dtype=object) if rows else np.empty((0, width), dtype=object)
+    if grid.ndim != 2 or grid.shape[1] != width:
+        # Ragged rows, or rows longer than the headers
+        grid = np.full((len(rows), width), "", dtype=object)
+        for i, row in enumerate(rows):
+            grid[i, : len(row)] = row[:width]
+    names = headers if headers is not None else list(range(width))
+    columns = {}
+    for i, name in enumerate(names):
+        series = pd.Series(grid[:, i], dtype=object, name=name)
+        series = series.mask(series == "")
+        if dtypes and name in dtypes:
+            columns[i] = _convert_column(series, dtypes[name])
+        elif infer_dtypes:
+            columns[i] = _infer_column(series)
+        else:
+            columns[i] = series
+    df = pd.DataFrame(columns, index=pd.RangeIndex(len(rows)))
+    df.columns = names if headers is not None else pd.RangeIndex(width)
+    return df
@@ -0,0 +1,194 @@
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QuerySpan:
+    """
+    The measurements of a single statement run by a hook.
+
+    Attributes:
+        operation (str): The hook operation, e.g. "fetch", "execute" or "upload".
+        query (str): The statement, or a short description of the operation.
+        hook (Optional[str]): The name of the hook class.
+        warehouse (Optional[str]): The warehouse the statement ran on, if any.
+        query_id (Optional[str]): The id the server assigned to the statement, if any.
+        rows (Optional[int]): The number of rows fetched or affected.
+        bytes (Optional[int]): The in-memory size of the fetched or uploaded data.
+        phases (Dict[str, float]): Seconds spent in each phase, e.g. "connect", "execute",
+            "fetch", "build" (DataFrame construction), "load" (uploads) and "merge" (upserts).
+        start_time (float): The wall clock time the span started at.
+        duration (Optional[float]): The total number of seconds of the span.
+        error (Optional[str]): The error raised by the statement, if any.
+        attributes (Dict[str, Any]): Any other attribute set by the hook.
+    """
+
+    operation: str
+    query: str
+    hook: Optional[str] = None
+    warehouse: Optional[str] = None
+    query_id: Optional[str] = None
+    rows: Optional[int] = None
+    bytes: Optional[int] = None
+    phases: Dict[str, float] = field(default_factory=dict)
+    start_time: float = field(default_factory=time.time)
+    duration: Optional[float] = None
+    error: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time a phase of the statement. Repeated phases are accumulated.
+
+        Args:
+            name (str): The name of the phase.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+
+class Instrumentation:
+    """
+    Dispatches the spans recorded by hooks to callbacks.
+
+    A callback is any callable receiving the finished `QuerySpan`, such as an
+    `InMemoryCollector`, a logger or an exporter to a tracing backend. Errors raised by the
+    callbacks are logged and never interrupt the instrumented call.
+
+    Args:
+        *callbacks (Callable[[QuerySpan], None]): The callbacks to notify.
+
+    Example:
+        collector = InMemoryCollector()
+        hook = SnowflakeHook(..., instrumentation=Instrumentation(collector))
+        hook.fetch_data("SELECT * FROM my_table")
+        print(collector.summary())
+    """
+
+    def __init__(self, *callbacks: Callable[[QuerySpan], None]) -> None:
+        self.callbacks: List[Callable[[QuerySpan], None]] = list(callbacks)
+
+    def add_callback(self, callback: Callable[[QuerySpan], None]) -> None:
+        self.callbacks.append(callback)
+
+    def remove_callback(self, callback: Callable[[QuerySpan], None]) -> None:
+        self.callbacks.remove(callback)
+
+    @contextmanager
+    def span(self, operation: str, query: str, **attributes: Any) -> Iterator[QuerySpan]:
+        """
+        Record a span around a statement.
+
+        Args:
+            operation (str): The hook operation.
+            query (str): The statement.
+            **attributes: Initial values of the `QuerySpan` fields, e.g. the warehouse.
+
+        Yields:
+            QuerySpan: The span, to be filled in by the instrumented code.
+        """
+        span = QuerySpan(operation, query, **attributes)
+        start = time.perf_counter()
+        try:
+            yield span
+        except Exception as e:
+            span.error = repr(e)
+            raise
+        finally:
+            span.duration = time.perf_counter() - start
+            for callback in self.callbacks:
+                try:
+                    callback(span)
+                except Exception as e:
+                    logger.warning(f"Error in instrumentation callback {callback}. Details: {e}")
+
+
+class InMemoryCollector:
+    """
+    Keeps the latest spans in memory and summarises their latencies.
+
+    Args:
+        max_spans (int, optional): The maximum number of spans kept. Defaults to 10000.
+    """
+
+    def __init__(self, max_spans: int = 10000) -> None:
+        self._spans: "deque[QuerySpan]" = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def __call__(self, span: QuerySpan) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    @property
+    def spans(self) -> List[QuerySpan]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Get the collected spans as a DataFrame, one row per span and one column per phase.
+
+        Returns:
+            pd.DataFrame: The collected spans.
+        """
+        return pd.DataFrame(
+            [
+                {
+                    "operation": span.operation,
+                    "query": span.query,
+                    "query_id": span.query_id,
+                    "warehouse": span.warehouse,
+                    "rows": span.rows,
+                    "bytes": span.bytes,
+                    "duration": span.duration,
+                    "error": span.error,
+                    **{f"{name}_time": seconds for name, seconds in span.phases.items()},
+                }
+                for span in self.spans
+            ]
+        )
+
+    def summary(self, percentiles: tuple = (0.5, 0.95)) -> pd.DataFrame:
+        """
+        Summarise the collected spans by operation.
+
+        Args:
+            percentiles (tuple, optional): The latency percentiles to compute.
+                Defaults to (0.5, 0.95).
+
+        Returns:
+            pd.DataFrame: The number of calls and errors, the total rows and the duration
+            percentiles (e.g. "p50", "p95") in seconds, by operation.
+        """
+        df = self.to_frame()
+        if df.empty:
+            return pd.DataFrame()
+        grouped = df.groupby("operation")
+        summary = pd.DataFrame(
+            {
+                "count": grouped.size(),
+                "errors": grouped["error"].count(),
+                "rows": grouped["rows"].sum(min_count=1),
+            }
+        )
+        for percentile in percentiles:
+            summary[f"p{percentile * 100:g}"] = grouped["duration"].quantile(percentile)
+        summary["max"] = grouped["duration"].max()
+        return summary
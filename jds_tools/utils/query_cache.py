@@ -0,0 +1,206 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCache:
+    """
+    A two tier cache for query results.
+
+    Results are kept in an in-memory LRU tier and, optionally, persisted as Parquet files in an
+    on-disk tier so they survive across processes (e.g. notebook restarts). Both tiers honour
+    the same time to live, and each tier evicts its oldest entries once it exceeds its size limit.
+
+    Args:
+        max_entries (int, optional): The maximum number of results kept in memory. Defaults to 128.
+        ttl (Optional[float], optional): The number of seconds a result stays valid. Defaults to
+            3600. None keeps results until they are evicted or invalidated.
+        cache_dir (Optional[str], optional): The directory of the on-disk tier. Defaults to None,
+            which disables it. Requires pyarrow.
+        max_disk_bytes (Optional[int], optional): The maximum size in bytes of the on-disk tier.
+            Defaults to None, which means unbounded.
+
+    Example:
+        cache = QueryCache(ttl=600, cache_dir=".query_cache")
+        hook = SnowflakeHook(..., cache=cache)
+        df = hook.fetch_data("SELECT * FROM my_table")  # hits Snowflake
+        df = hook.fetch_data("SELECT *  FROM my_table;")  # served from the cache
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl: Optional[float] = 3600,
+        cache_dir: Optional[str] = None,
+        max_disk_bytes: Optional[int] = None,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be a positive integer.")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, Tuple[float, pd.DataFrame]]" = OrderedDict()
+        self._lock = threading.Lock()
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(
+        queries: List[str],
+        context: Optional[Dict[str, Any]] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Build a cache key from normalised queries and the connection context.
+
+        The fetch options (e.g. the engine) are hashed on their own and appended to the key of
+        the query, so `invalidate` can drop every variant of a query at once.
+
+        Args:
+            queries (List[str]): The normalised queries, as returned by `DataHook._split_queries`.
+            context (Optional[Dict[str, Any]], optional): The connection context the result
+                depends on (database, schema, role, ...). Defaults to None.
+            options (Optional[Dict[str, Any]], optional): The fetch options the result depends
+                on. Defaults to None.
+
+        Returns:
+            str: A hex digest identifying the result, followed by "-" and the digest of the
+            options when there are any.
+        """
+        payload = json.dumps({"queries": queries, "context": context or {}}, sort_keys=True)
+        key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        if options:
+            payload = json.dumps(options, sort_keys=True)
+            key += "-" + hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+        return key
+
+    def _is_expired(self, created_at: float) -> bool:
+        return self.ttl is not None and time.time() - created_at > self.ttl
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.parquet")
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        Get a cached result.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Optional[pd.DataFrame]: A copy of the cached result, or None on a miss.
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, df = entry
+                if not self._is_expired(created_at):
+                    self._memory.move_to_end(key)
+                    return df.copy()
+                del self._memory[key]
+
+            if self.cache_dir is None:
+                return None
+            path = self._disk_path(key)
+            try:
+                created_at = os.path.getmtime(path)
+            except OSError:
+                return None
+            if self._is_expired(created_at):
+                self._remove_file(path)
+                return None
+            try:
+                df = pd.read_parquet(path)
+            except Exception as e:
+                logger.warning(f"Error reading cached result {path}. Details: {e}")
+                self._remove_file(path)
+                return None
+            self._store_in_memory(key, created_at, df)
+            return df.copy()
+
+    def set(self, key: str, df: pd.DataFrame) -> None:
+        """
+        Cache a result in every enabled tier.
+
+        Args:
+            key (str): The cache key.
+            df (pd.DataFrame): The result to cache.
+        """
+        created_at = time.time()
+        with self._lock:
+            self._store_in_memory(key, created_at, df.copy())
+            if self.cache_dir is None:
+                return
+            try:
+                df.to_parquet(self._disk_path(key), index=False)
+            except Exception as e:
+                # Persisting is best effort, e.g. frames with mixed object columns are skipped
+                logger.warning(f"Error persisting cached result {key}. Details: {e}")
+                return
+            self._evict_disk()
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """
+        Invalidate a cached result, or the whole cache if no key is given.
+
+        Invalidating the key of a query also drops the results cached with any fetch options,
+        see `make_key`.
+
+        Args:
+            key (Optional[str], optional): The cache key. Defaults to None.
+        """
+        with self._lock:
+            if key is not None:
+                variants = f"{key}-"
+                for cached_key in [k for k in self._memory if k == key or k.startswith(variants)]:
+                    del self._memory[cached_key]
+                if self.cache_dir is not None:
+                    self._remove_file(self._disk_path(key))
+                    for path in self._disk_files():
+                        if os.path.basename(path).startswith(variants):
+                            self._remove_file(path)
+                return
+            self._memory.clear()
+            if self.cache_dir is not None:
+                for path in self._disk_files():
+                    self._remove_file(path)
+
+    def _store_in_memory(self, key: str, created_at: float, df: pd.DataFrame) -> None:
+        self._memory[key] = (created_at, df)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_files(self) -> List[str]:
+        return [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir)
+            if name.endswith(".parquet")
+        ]
+
+    def _evict_disk(self) -> None:
+        if self.max_disk_bytes is None:
+            return
+        files = sorted(self._disk_files(), key=os.path.getmtime)
+        total = sum(os.path.getsize(path) for path in files)
+        while files and total > self.max_disk_bytes:
+            path = files.pop(0)
+            total -= os.path.getsize(path)
+            self._remove_file(path)
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
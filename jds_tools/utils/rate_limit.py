@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket refilled continuously at a fixed rate.
+
+    Callers reserve tokens even when the bucket is empty, pushing the balance below zero, and
+    then wait until their reservation is covered. Reservations are therefore served in the
+    order they are made, whether the callers are threads or coroutines.
+
+    Args:
+        rate (float): The number of tokens added per second.
+        capacity (Optional[float], optional): The maximum number of tokens, i.e. the largest
+            burst. Defaults to None, which uses `rate`.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be a positive number.")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated_at)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = max(now, self._updated_at)
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Reserve tokens from the bucket.
+
+        Args:
+            tokens (float, optional): The number of tokens. Defaults to 1.
+
+        Returns:
+            float: The number of seconds to wait before the reservation is covered.
+        """
+        with self._lock:
+            self.__refill(time.monotonic())
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after the server reported that the quota was exceeded."""
+        with self._lock:
+            self.__refill(time.monotonic())
+            self._tokens = min(self._tokens, 0.0)
+
+    def acquire(self, tokens: float = 1) -> None:
+        """Take tokens from the bucket, blocking the thread until they are available."""
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+
+    async def aacquire(self, tokens: float = 1) -> None:
+        """Take tokens from the bucket, without blocking the event loop."""
+        delay = self.reserve(tokens)
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class RateLimiter:
+    """
+    Schedules API calls under per-minute quotas and retries transient errors.
+
+    Every kind of call (e.g. "read" and "write") draws from its own `TokenBucket`, which allows
+    bursts of up to `burst_seconds` worth of quota and then paces the calls evenly. Calls
+    failing with an error accepted by `retry_on` are retried with exponential backoff and full
+    jitter, and drain the bucket so every other caller sharing the limiter slows down too.
+
+    Use `RateLimiter.shared` to get a single limiter per key, e.g. per service account, so
+    the calls of every hook using the same credentials are queued together.
+
+    Args:
+        quotas (Dict[str, float]): The number of calls allowed per minute, by kind of call.
+        retry_on (Callable[[Exception], bool], optional): Whether an error is transient.
+            Defaults to never retrying.
+        max_retries (int, optional): The number of times a failed call is retried. Defaults to 5.
+        base_delay (float, optional): The seconds of backoff after the first failure, doubled
+            on every retry. Defaults to 1.
+        max_delay (float, optional): The maximum seconds of backoff. Defaults to 64.
+        burst_seconds (float, optional): The seconds of quota that can be used at once.
+            Defaults to 10.
+    """
+
+    _shared: Dict[Hashable, "RateLimiter"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        quotas: Dict[str, float],
+        *,
+        retry_on: Callable[[Exception], bool] = lambda error: False,
+        max_retries: int = 5,
+        base_delay: float = 1,
+        max_delay: float = 64,
+        burst_seconds: float = 10,
+    ) -> None:
+        self.buckets = {
+            kind: TokenBucket(per_minute / 60, max(1, per_minute / 60 * burst_seconds))
+            for kind, per_minute in quotas.items()
+        }
+        self.retry_on = retry_on
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @classmethod
+    def shared(cls, key: Hashable, quotas: Dict[str, float], **kwargs) -> "RateLimiter":
+        """
+        Get the limiter shared by every caller with the same key, creating it on first use.
+
+        Args:
+            key (Hashable): The key, e.g. the service account email.
+            quotas (Dict[str, float]): The quotas of the limiter, if it has to be created.
+            **kwargs: The other arguments of the limiter, if it has to be created.
+
+        Returns:
+            RateLimiter: The shared limiter.
+        """
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(quotas, **kwargs)
+            return cls._shared[key]
+
+    def backoff(self, attempt: int) -> float:
+        """Get the seconds to wait before a retry, with full jitter."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def __should_retry(self, kind: str, error: Exception, attempt: int, max_retries: int) -> bool:
+        if attempt >= max_retries or not self.retry_on(error):
+            return False
+        self.buckets[kind].drain()
+        return True
+
+    def call(
+        self,
+        kind: str,
+        function: Callable[..., Any],
+        *args,
+        max_retries: Optional[int] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Call a function once a token of its kind is available, retrying transient errors.
+
+        Args:
+            kind (str): The kind of call, i.e. the quota it counts against.
+            function (Callable[..., Any]): The function.
+            *args: The positional arguments of the function.
+            max_retries (Optional[int], optional): Overrides the limiter `max_retries`.
+            **kwargs: The keyword arguments of the function.
+
+        Returns:
+            Any: The result of the function.
+        """
+        max_retries = self.max_retries if max_retries is None else max_retries
+        attempt = 0
+        while True:
+            self.buckets[kind].acquire()
+            try:
+                return function(*args, **kwargs)
+            except Exception as e:
+                if not self.__should_retry(kind, e, attempt, max_retries):
+                    raise
+                delay = self.backoff(attempt)
+                logger.warning(
+                    f"Transient error on a {kind} call, retrying in {delay:.1f}s. Details: {e}"
+                )
+                time.sleep(delay)
+                attempt += 1
+
+    async def acall(
+        self,
+        kind: str,
+        function: Callable[..., Awaitable[Any]],
+        *args,
+        max_retries: Optional[int] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Await a coroutine function once a token of its kind is available, retrying transient errors.
+
+        Args:
+            kind (str): The kind of call, i.e. the quota it counts against.
+            function (Callable[..., Awaitable[Any]]): The coroutine function.
+            *args: The positional arguments of the function.
+            max_retries (Optional[int], optional): Overrides the limiter `max_retries`.
+            **kwargs: The keyword arguments of the function.
+
+        Returns:
+            Any: The result of the coroutine.
+        """
+        max_retries = self.max_retries if max_retries is None else max_retries
+        attempt = 0
+        while True:
+            await self.buckets[kind].aacquire()
+            try:
+                return await function(*args, **kwargs)
+            except Exception as e:
+                if not self.__should_retry(kind, e, attempt, max_retries):
+                    raise
+                delay = self.backoff(attempt)
+                logger.warning(
+                    f"Transient error on a {kind} call, retrying in {delay:.1f}s. Details: {e}"
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
@@ -0,0 +1,138 @@
+import datetime
+import decimal
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+def to_json_value(value: Any) -> Any:
+    """
+    Convert a value (e.g. a watermark read from a DataFrame) to a JSON serialisable one.
+
+    Timestamps and dates become ISO 8601 strings, numpy scalars become Python scalars and
+    decimals become strings, so no precision is lost.
+
+    Args:
+        value (Any): The value to convert.
+
+    Returns:
+        Any: The JSON serialisable value.
+    """
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, (pd.Timestamp, datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class StateStore(ABC):
+    """A small persistent key-value store, e.g. for the watermarks of incremental extracts."""
+
+    @abstractmethod
+    def get(self, key: str, default: Any = None) -> Any:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+
+class JsonStateStore(StateStore):
+    """
+    A state store persisted in a local JSON file.
+
+    Every write rewrites the file atomically, so a crash never leaves it half written.
+
+    Args:
+        path (str): The path of the JSON file. It is created on the first write.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+
+    def _write(self, state: dict) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(state, file, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._read().get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            state = self._read()
+            state[key] = to_json_value(value)
+            self._write(state)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            state = self._read()
+            if state.pop(key, None) is not None:
+                self._write(state)
+
+
+class SQLiteStateStore(StateStore):
+    """
+    A state store persisted in a local SQLite database.
+
+    Args:
+        path (str): The path of the SQLite database file.
+        table (str, optional): The name of the table holding the state. Defaults to "state".
+    """
+
+    def __init__(self, path: str, table: str = "state") -> None:
+        self.path = path
+        self.table = table
+        self._execute(f"CREATE TABLE IF NOT EXISTS {self.table} (key TEXT PRIMARY KEY, value TEXT)")
+
+    def _execute(self, sql: str, parameters: tuple = ()) -> list:
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                return connection.execute(sql, parameters).fetchall()
+        finally:
+            connection.close()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        rows = self._execute(f"SELECT value FROM {self.table} WHERE key = ?", (key,))
+        return json.loads(rows[0][0]) if rows else default
+
+    def set(self, key: str, value: Any) -> None:
+        self._execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value) VALUES (?, ?)",
+            (key, json.dumps(to_json_value(value))),
+        )
+
+    def delete(self, key: str) -> None:
+        self._execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
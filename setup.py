@@ -36,7 +36,13 @@ setup(
         "jinja2>=3.0.0, <4.0.0",
         "aiohttp==3.9.5",
         "gspread>=6.0.0, <7.0.0",
+        "google-auth>=2.0.0, <3.0.0",
+        "requests>=2.0.0, <3.0.0",
+        "yarl>=1.0.0, <2.0.0",
     ],
+    extras_require={
+        "arrow": ["pyarrow>=14.0.0"],
+    },
     long_description=readme(),
     long_description_content_type="text/markdown",
     url="https://github.com/juandaherrera/jds_tools",
@@ -0,0 +1,239 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import aiohttp
+import pandas as pd
+import pytest
+
+from jds_tools.hooks import AsyncGoogleSheetsHook
+from jds_tools.hooks.google_hook import GoogleCredentialsType, is_retryable
+from jds_tools.utils.rate_limit import RateLimiter
+
+VALUES_URL = "https://sheets.googleapis.com/v4/spreadsheets/spreadsheet_id/values"
+
+
+class FakeResponse:
+    def __init__(self, status=200, payload=None):
+        self.status = status
+        self.payload = payload if payload is not None else {}
+        self.request_info = MagicMock()
+        self.history = ()
+        self.headers = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    async def json(self):
+        return self.payload
+
+    async def text(self):
+        return str(self.payload)
+
+
+class FakeSession:
+    """Records the requests and answers them with the queued responses, or an empty one."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+        self.closed = False
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, str(url), kwargs))
+        return self.responses.pop(0) if self.responses else FakeResponse()
+
+
+@pytest.fixture
+def credentials():
+    credentials = MagicMock(valid=True, token="token", service_account_email="sa@test")
+
+    def refresh(request):
+        credentials.valid = True
+        credentials.token = "new_token"
+
+    credentials.refresh.side_effect = refresh
+    return credentials
+
+
+def make_hook(credentials, session, **kwargs):
+    with patch(
+        "jds_tools.hooks.async_google_hook.Credentials.from_service_account_info",
+        return_value=credentials,
+    ):
+        return AsyncGoogleSheetsHook(
+            "spreadsheet_id",
+            credentials={},
+            credentials_type=GoogleCredentialsType.VARIABLE,
+            session=session,
+            rate_limiter=RateLimiter({"read": 60000, "write": 60000}, retry_on=is_retryable),
+            **kwargs,
+        )
+
+
+@pytest.mark.unit
+def test_invalid_credentials_file():
+    with pytest.raises(ValueError):
+        AsyncGoogleSheetsHook("spreadsheet_id", credentials="missing.json")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_read(credentials):
+    session = FakeSession(FakeResponse(payload={"values": [["a", "b"], ["1"], ["2", "x"]]}))
+    hook = make_hook(credentials, session)
+
+    df = await hook.read("My Sheet", "A1:B3", return_df=True, value_render_option="FORMULA")
+
+    pd.testing.assert_frame_equal(df, pd.DataFrame([["1", ""], ["2", "x"]], columns=["a", "b"]))
+    [(method, url, kwargs)] = session.requests
+    assert method == "GET"
+    assert url == f"{VALUES_URL}/%27My%20Sheet%27%21A1%3AB3"
+    assert kwargs["params"] == {
+        "valueRenderOption": "FORMULA",
+        "dateTimeRenderOption": "FORMATTED_STRING",
+    }
+    assert kwargs["headers"] == {"Authorization": "Bearer token"}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_write_in_concurrent_blocks(credentials):
+    session = FakeSession()
+    hook = make_hook(credentials, session)
+    df = pd.DataFrame({"a": range(5), "b": range(5)})
+
+    await hook.write("Sheet1", df, table_range="B2", raw=True, chunk_cells=4)
+
+    urls = [url for _, url, _ in session.requests]
+    assert urls == [
+        f"{VALUES_URL}/%27Sheet1%27%21B2",
+        f"{VALUES_URL}/%27Sheet1%27%21B4",
+        f"{VALUES_URL}/%27Sheet1%27%21B6",
+    ]
+    assert all(method == "PUT" for method, _, _ in session.requests)
+    bodies = [kwargs["json"]["values"] for _, _, kwargs in session.requests]
+    assert bodies == [[["a", "b"], [0, 0]], [[1, 1], [2, 2]], [[3, 3], [4, 4]]]
+    assert session.requests[0][2]["params"] == {"valueInputOption": "RAW"}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_append_and_clear(credentials):
+    session = FakeSession()
+    hook = make_hook(credentials, session)
+
+    await hook.append("Sheet1", pd.Series({"a": 1, "b": 2}))
+    await hook.clear("Sheet1")
+    await hook.clear("Sheet1", ["A2:B3", "D1"])
+
+    [append, clear_all, clear_ranges] = session.requests
+    assert append[0:2] == ("POST", f"{VALUES_URL}/%27Sheet1%27:append")
+    assert append[2]["json"]["values"] == [[1, 2]]
+    assert append[2]["params"] == {"valueInputOption": "USER_ENTERED"}
+    assert clear_all[0:2] == ("POST", f"{VALUES_URL}/%27Sheet1%27:clear")
+    assert clear_ranges[0:2] == ("POST", f"{VALUES_URL}:batchClear")
+    assert clear_ranges[2]["json"] == {"ranges": ["'Sheet1'!A2:B3", "'Sheet1'!D1"]}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_token_refreshed_once_and_shared(credentials):
+    credentials.valid = False
+    session = FakeSession()
+    hook = make_hook(credentials, session)
+    other = hook.for_spreadsheet("other_id")
+
+    await asyncio.gather(*(h.read("Sheet1") for h in [hook, other] * 5))
+
+    credentials.refresh.assert_called_once()
+    assert all(
+        kwargs["headers"] == {"Authorization": "Bearer new_token"}
+        for *_, kwargs in session.requests
+    )
+    assert sum("/other_id/" in url for _, url, _ in session.requests) == 5
+    assert other.rate_limiter is hook.rate_limiter
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded(credentials):
+    in_flight = 0
+    peak = 0
+
+    class SlowResponse(FakeResponse):
+        async def __aenter__(self):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            return self
+
+        async def __aexit__(self, *exc_info):
+            nonlocal in_flight
+            in_flight -= 1
+
+    session = FakeSession(*(SlowResponse() for _ in range(10)))
+    hook = make_hook(credentials, session, max_concurrency=3)
+
+    await asyncio.gather(*(hook.read(f"Sheet{i}") for i in range(10)))
+
+    assert len(session.requests) == 10
+    assert peak == 3
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried(credentials):
+    session = FakeSession(
+        FakeResponse(status=429, payload={"error": "quota"}),
+        FakeResponse(payload={"values": [["a"]]}),
+    )
+    hook = make_hook(credentials, session)
+
+    with patch("jds_tools.utils.rate_limit.asyncio.sleep") as sleep_mock:
+        assert await hook.read("Sheet1") == [["a"]]
+    assert sleep_mock.await_count == 1
+    assert len(session.requests) == 2
+
+    session.responses = [FakeResponse(status=400, payload={"error": "bad range"})]
+    with pytest.raises(aiohttp.ClientResponseError) as error:
+        await hook.read("Sheet1")
+    assert error.value.status == 400
+    assert "bad range" in error.value.message
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_close_keeps_given_session(credentials):
+    session = FakeSession()
+    session.close = MagicMock()
+    async with make_hook(credentials, session) as hook:
+        await hook.read("Sheet1")
+    session.close.assert_not_called()
+
+
+@pytest.mark.unit
+def test_owned_session_closed_on_new_loop(credentials):
+    sessions = []
+
+    def open_session(**kwargs):
+        session = FakeSession()
+
+        async def close():
+            session.closed = True
+
+        session.close = close
+        sessions.append(session)
+        return session
+
+    hook = make_hook(credentials, None)
+    with patch("jds_tools.hooks.async_google_hook.aiohttp.ClientSession", side_effect=open_session):
+        asyncio.run(hook.read("Sheet1"))
+        asyncio.run(hook.read("Sheet1"))
+        asyncio.run(hook.close())
+
+    assert len(sessions) == 2
+    assert all(session.closed for session in sessions)
@@ -0,0 +1,309 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import gspread
+import numpy as np
+import pandas as pd
+import pytest
+from gspread.utils import DateTimeOption, ValueRenderOption
+
+from jds_tools.hooks import GoogleSheetsHook
+from jds_tools.hooks.google_hook import (
+    GoogleCredentialsType,
+    SheetWrite,
+    default_rate_limiter,
+    is_retryable,
+)
+from jds_tools.utils.rate_limit import RateLimiter
+
+
+def make_worksheet(title):
+    sheet = MagicMock()
+    sheet.title = title
+    return sheet
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    spreadsheet = client.open_by_key.return_value
+    spreadsheet.worksheets.return_value = [make_worksheet("Sheet1"), make_worksheet("Sheet2")]
+    return client
+
+
+@pytest.fixture
+def google_hook(client):
+    with patch(
+        "jds_tools.hooks.google_hook.gspread.service_account_from_dict", return_value=client
+    ):
+        return GoogleSheetsHook(
+            "spreadsheet_id",
+            credentials={},
+            credentials_type=GoogleCredentialsType.VARIABLE,
+            rate_limiter=RateLimiter({"read": 60000, "write": 60000}, retry_on=is_retryable),
+        )
+
+
+@pytest.mark.unit
+def test_default_rate_limiter(client):
+    client.http_client.auth = MagicMock(spec=[])
+    with patch(
+        "jds_tools.hooks.google_hook.gspread.service_account_from_dict", return_value=client
+    ):
+        first, second = (
+            GoogleSheetsHook(
+                "spreadsheet_id", credentials={}, credentials_type=GoogleCredentialsType.VARIABLE
+            )
+            for _ in range(2)
+        )
+
+    assert first.rate_limiter is not second.rate_limiter
+    assert default_rate_limiter("sa@test") is default_rate_limiter("sa@test")
+
+
+@pytest.mark.unit
+def test_handles_are_reused(google_hook, client):
+    google_hook.write("Sheet1", [["a"]])
+    google_hook.write("Sheet1", [["b"]])
+    google_hook.clear("Sheet2")
+
+    client.open_by_key.assert_called_once_with("spreadsheet_id")
+    spreadsheet = client.open_by_key.return_value
+    spreadsheet.worksheets.assert_called_once()
+    assert google_hook.worksheet("Sheet1").update.call_count == 2
+
+
+@pytest.mark.unit
+def test_handles_expire(google_hook, client):
+    google_hook.handle_ttl = 60
+    with patch("jds_tools.hooks.google_hook.time.monotonic", return_value=1000):
+        google_hook.worksheet("Sheet1")
+    with patch("jds_tools.hooks.google_hook.time.monotonic", return_value=1059):
+        google_hook.worksheet("Sheet1")
+    assert client.open_by_key.call_count == 1
+
+    with patch("jds_tools.hooks.google_hook.time.monotonic", return_value=1060):
+        google_hook.worksheet("Sheet1")
+    assert client.open_by_key.call_count == 2
+
+
+@pytest.mark.unit
+def test_refresh_and_spreadsheet_id_change(google_hook, client):
+    google_hook.worksheet("Sheet1")
+    google_hook.refresh()
+    google_hook.worksheet("Sheet1")
+    assert client.open_by_key.call_count == 2
+
+    google_hook.spreadsheet_id = "spreadsheet_id"
+    google_hook.worksheet("Sheet1")
+    assert client.open_by_key.call_count == 2
+
+    google_hook.spreadsheet_id = "other_id"
+    google_hook.worksheet("Sheet1")
+    client.open_by_key.assert_called_with("other_id")
+
+
+@pytest.mark.unit
+def test_missing_worksheet_reloads_titles(google_hook, client):
+    spreadsheet = client.open_by_key.return_value
+    google_hook.worksheet("Sheet1")
+    spreadsheet.worksheets.return_value = [make_worksheet("Sheet1"), make_worksheet("New")]
+
+    assert google_hook.worksheet("New").title == "New"
+    with pytest.raises(gspread.WorksheetNotFound):
+        google_hook.worksheet("Missing")
+
+
+@pytest.mark.unit
+def test_read_many(google_hook, client):
+    spreadsheet = client.open_by_key.return_value
+    spreadsheet.values_batch_get.return_value = {
+        "valueRanges": [
+            {"range": "'Sheet1'!A1:B3", "values": [["id", "name"], ["1", "Juan"], ["2"]]},
+            {"range": "'Sheet 2'!A1:Z1000"},
+        ]
+    }
+
+    result = google_hook.read_many({"Sheet1": "A1:B3", "Sheet 2": None}, return_df=True)
+
+    spreadsheet.values_batch_get.assert_called_once_with(
+        ["'Sheet1'!A1:B3", "'Sheet 2'"], params=None
+    )
+    assert result["Sheet1"].to_dict("list") == {"id": ["1", "2"], "name": ["Juan", ""]}
+    assert result["Sheet 2"].empty
+    spreadsheet.worksheets.assert_not_called()
+
+
+@pytest.mark.unit
+def test_write_many_single_request(google_hook, client):
+    spreadsheet = client.open_by_key.return_value
+    sheet1, sheet2 = spreadsheet.worksheets.return_value
+    sheet1.id, sheet2.id = 10, 20
+    df = pd.DataFrame({"id": [1, 2], "value": [0.5, np.nan], "flag": [True, False]})
+
+    google_hook.write_many(
+        [
+            SheetWrite("Sheet1", df, "B2"),
+            ("Sheet2", [["=SUM(A1:A2)", "text"]]),
+        ],
+        clear_ranges={"Sheet1": "B2:D", "Sheet2": None},
+    )
+
+    spreadsheet.batch_update.assert_called_once()
+    clear1, clear2, write1, write2 = spreadsheet.batch_update.call_args[0][0]["requests"]
+    assert clear1["updateCells"]["range"] == {
+        "sheetId": 10,
+        "startRowIndex": 1,
+        "startColumnIndex": 1,
+        "endColumnIndex": 4,
+    }
+    assert clear2["updateCells"]["range"] == {"sheetId": 20}
+    assert write1["updateCells"]["start"] == {"sheetId": 10, "rowIndex": 1, "columnIndex": 1}
+    rows = write1["updateCells"]["rows"]
+    assert rows[0]["values"][0] == {"userEnteredValue": {"stringValue": "id"}}
+    assert rows[1]["values"] == [
+        {"userEnteredValue": {"numberValue": 1}},
+        {"userEnteredValue": {"numberValue": 0.5}},
+        {"userEnteredValue": {"boolValue": True}},
+    ]
+    assert rows[2]["values"][1] == {}
+    assert write2["updateCells"]["rows"][0]["values"] == [
+        {"userEnteredValue": {"formulaValue": "=SUM(A1:A2)"}},
+        {"userEnteredValue": {"stringValue": "text"}},
+    ]
+    json.dumps(spreadsheet.batch_update.call_args[0][0])
+    sheet1.update.assert_not_called()
+
+
+def make_api_error(code):
+    response = MagicMock()
+    response.json.return_value = {"error": {"code": code, "message": "error"}}
+    return gspread.exceptions.APIError(response)
+
+
+@pytest.mark.unit
+def test_write_small_payload_single_request(google_hook):
+    google_hook.write("Sheet1", [["a", "b"], ["c", "d"]], table_range="B2")
+
+    google_hook.worksheet("Sheet1").update.assert_called_once_with(
+        "B2", [["a", "b"], ["c", "d"]], raw=False
+    )
+
+
+@pytest.mark.unit
+def test_write_chunked(google_hook):
+    df = pd.DataFrame({"a": range(10), "b": range(10)})
+
+    google_hook.write("Sheet1", df, table_range="B3:C20", chunk_cells=8, max_workers=2)
+
+    calls = google_hook.worksheet("Sheet1").update.call_args_list
+    blocks = {call.args[0]: call.args[1] for call in calls}
+    assert list(blocks) == ["B3", "B7", "B11"]
+    assert blocks["B3"] == [["a", "b"], [0, 0], [1, 1], [2, 2]]
+    assert blocks["B11"] == [[7, 7], [8, 8], [9, 9]]
+
+
+@pytest.mark.unit
+def test_write_retries_failed_block(google_hook):
+    sheet = google_hook.worksheet("Sheet1")
+    sheet.update.side_effect = [None, make_api_error(429), None]
+
+    with patch("jds_tools.utils.rate_limit.time.sleep") as sleep_mock:
+        google_hook.write("Sheet1", [["a"], ["b"]], chunk_cells=1, max_workers=1)
+
+    assert [call.args[0] for call in sheet.update.call_args_list] == ["A1", "A2", "A2"]
+    assert sleep_mock.called
+
+
+@pytest.mark.unit
+def test_write_does_not_retry_client_errors(google_hook):
+    sheet = google_hook.worksheet("Sheet1")
+    sheet.update.side_effect = make_api_error(400)
+
+    with pytest.raises(gspread.exceptions.APIError):
+        google_hook.write("Sheet1", [["a"]])
+    sheet.update.assert_called_once()
+
+
+@pytest.mark.unit
+def test_write_diff(google_hook):
+    sheet = google_hook.worksheet("Sheet1")
+    sheet.get_values.return_value = [["id", "value"], ["1", "a"]]
+    df = pd.DataFrame({"id": [1, 2, 3], "value": ["a", "b", "c"]})
+
+    google_hook.write("Sheet1", df, table_range="B2", mode="diff")
+
+    sheet.get_values.assert_called_once()
+    assert sheet.get_values.call_args.args[0] == "B2:C5"
+    sheet.batch_update.assert_called_once_with(
+        [{"range": "B4:C5", "values": [[2, "b"], [3, "c"]]}], raw=False
+    )
+
+    sheet.batch_update.reset_mock()
+    df.loc[0, "value"] = "z"
+    google_hook.write("Sheet1", df.iloc[:2], table_range="B2", mode="diff")
+
+    sheet.get_values.assert_called_once()
+    sheet.batch_update.assert_called_once_with(
+        [{"range": "C3:C3", "values": [["z"]]}, {"range": "B5:C5", "values": [["", ""]]}],
+        raw=False,
+    )
+    sheet.update.assert_not_called()
+
+
+@pytest.mark.unit
+def test_write_diff_unchanged_and_forgotten(google_hook):
+    sheet = google_hook.worksheet("Sheet1")
+    sheet.get_values.return_value = []
+    google_hook.write("Sheet1", [["a"]], mode="diff")
+    google_hook.write("Sheet1", [["a"]], mode="diff")
+    assert sheet.batch_update.call_count == 1
+
+    google_hook.clear("Sheet1")
+    google_hook.write("Sheet1", [["a"]], mode="diff")
+    assert sheet.get_values.call_count == 2
+    assert sheet.batch_update.call_count == 2
+
+
+@pytest.mark.unit
+def test_write_diff_snapshot_dir(google_hook, client, tmp_path):
+    google_hook.snapshot_dir = str(tmp_path)
+    sheet = google_hook.worksheet("Sheet1")
+    sheet.get_values.return_value = []
+    google_hook.write("Sheet1", [["a", "b"]], mode="diff")
+    assert len(list(tmp_path.iterdir())) == 1
+
+    with patch(
+        "jds_tools.hooks.google_hook.gspread.service_account_from_dict", return_value=client
+    ):
+        other_hook = GoogleSheetsHook(
+            "spreadsheet_id",
+            credentials={},
+            credentials_type=GoogleCredentialsType.VARIABLE,
+            snapshot_dir=str(tmp_path),
+        )
+    sheet.batch_update.reset_mock()
+    other_hook.write("Sheet1", [["a", "c"]], mode="diff")
+
+    sheet.get_values.assert_called_once()
+    sheet.batch_update.assert_called_once_with([{"range": "B1:B1", "values": [["c"]]}], raw=False)
+
+    other_hook.write("Sheet1", [["a", "c"]])
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.unit
+def test_read_typed(google_hook):
+    sheet = google_hook.worksheet("Sheet1")
+    sheet.get_all_values.return_value = [["id", "day"], [1, "2024-01-02"], [2, ""]]
+
+    df = google_hook.read(
+        "Sheet1", return_df=True, infer_dtypes=True, value_render_option="UNFORMATTED_VALUE"
+    )
+
+    sheet.get_all_values.assert_called_once_with(
+        range_name=None,
+        value_render_option=ValueRenderOption.unformatted,
+        date_time_render_option=DateTimeOption.formatted_string,
+    )
+    assert df.dtypes.to_dict() == {"id": "Int64", "day": "datetime64[ns]"}
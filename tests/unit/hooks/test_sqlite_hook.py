@@ -0,0 +1,107 @@
+import pandas as pd
+import pytest
+
+from jds_tools.hooks import SQLiteHook
+from jds_tools.utils.instrumentation import InMemoryCollector, Instrumentation
+
+
+@pytest.fixture
+def sqlite_hook():
+    hook = SQLiteHook()
+    hook.execute_statement("""
+        CREATE TABLE people (id INTEGER, name TEXT); -- a comment
+        INSERT INTO people VALUES (1, 'Juan'), (2, 'David');
+        """)
+    return hook
+
+
+@pytest.mark.unit
+def test_fetch_data(sqlite_hook):
+    expected_df = pd.DataFrame({"id": [1, 2], "name": ["Juan", "David"]})
+    pd.testing.assert_frame_equal(sqlite_hook.fetch_data("SELECT * FROM people"), expected_df)
+
+
+@pytest.mark.unit
+def test_fetch_data_error_returns_empty(sqlite_hook):
+    assert sqlite_hook.fetch_data("SELECT * FROM missing_table").empty
+
+
+@pytest.mark.unit
+def test_fetch_batches(sqlite_hook):
+    batches = list(sqlite_hook.fetch_batches("SELECT * FROM people ORDER BY id", batch_size=1))
+    assert [batch["name"].tolist() for batch in batches] == [["Juan"], ["David"]]
+
+
+@pytest.mark.unit
+def test_fetch_batches_optimize_dtypes(sqlite_hook):
+    sqlite_hook.execute_statement(
+        "INSERT INTO people VALUES (3, 'Juan'), (4, 'Juan'), (5, 'Ana'), (1000, 'Luz');"
+    )
+    batches = list(
+        sqlite_hook.fetch_batches(
+            "SELECT * FROM people ORDER BY id", batch_size=4, optimize_dtypes=True
+        )
+    )
+
+    assert [str(batch["id"].dtype) for batch in batches] == ["Int64", "Int64"]
+    assert [batch["name"].dtype for batch in batches] == ["category", "category"]
+    assert pd.concat(batches)["id"].dtype == "Int64"
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("method", ["insert", "copy"])
+def test_upload_data(sqlite_hook, method):
+    data = pd.DataFrame({"id": [3], "name": ["Herrera"]})
+    sqlite_hook.upload_data(data, "people", method=method)
+    assert sqlite_hook.fetch_data("SELECT COUNT(*) AS n FROM people")["n"][0] == 3
+
+
+@pytest.mark.unit
+def test_batches_and_uploads_record_spans(sqlite_hook):
+    collector = InMemoryCollector()
+    sqlite_hook.instrumentation = Instrumentation(collector)
+
+    list(sqlite_hook.fetch_batches("SELECT * FROM people", batch_size=1))
+    sqlite_hook.upload_data(pd.DataFrame({"id": [3], "name": ["Herrera"]}), "people")
+
+    fetch, upload = collector.spans
+    assert (fetch.operation, fetch.rows) == ("fetch_batches", 2)
+    assert fetch.bytes > 0
+    assert (upload.operation, upload.query, upload.rows) == ("upload", "INSERT INTO people", 1)
+
+
+@pytest.mark.unit
+def test_upsert_data(sqlite_hook):
+    data = pd.DataFrame({"id": [2, 3], "name": ["Dave", "Herrera"]})
+
+    counts = sqlite_hook.upsert_data(data, "people", ["id"])
+
+    assert counts == {"inserted": 1, "updated": 1}
+    result_df = sqlite_hook.fetch_data("SELECT * FROM people ORDER BY id")
+    assert result_df["name"].tolist() == ["Juan", "Dave", "Herrera"]
+
+
+@pytest.mark.unit
+def test_export(sqlite_hook, tmp_path):
+    manifest = sqlite_hook.export("SELECT * FROM people", str(tmp_path), format="csv")
+    assert [entry["rows"] for entry in manifest] == [2]
+    pd.testing.assert_frame_equal(
+        pd.read_csv(manifest[0]["path"]), sqlite_hook.fetch_data("SELECT * FROM people")
+    )
+
+
+@pytest.mark.unit
+def test_export_parquet_promotes_schema(sqlite_hook, tmp_path):
+    sqlite_hook.execute_statement("""
+        CREATE TABLE readings (id INTEGER, v REAL);
+        INSERT INTO readings VALUES (1, NULL), (2, NULL), (3, NULL), (4, 1.5), (5, NULL);
+        """)
+
+    manifest = sqlite_hook.export(
+        "SELECT * FROM readings ORDER BY id", str(tmp_path), rows_per_file=10, batch_size=3
+    )
+
+    assert [entry["rows"] for entry in manifest] == [3, 2]
+    exported = pd.concat([pd.read_parquet(entry["path"]) for entry in manifest], ignore_index=True)
+    assert exported["id"].tolist() == [1, 2, 3, 4, 5]
+    assert exported["v"].tolist()[3] == 1.5
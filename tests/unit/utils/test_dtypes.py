@@ -0,0 +1,101 @@
+import datetime
+import decimal
+
+import pandas as pd
+import pytest
+
+from jds_tools.utils.dtypes import (
+    ColumnType,
+    frame_from_rows,
+    infer_column_types,
+    optimize_dtypes,
+    pin_text_dtypes,
+)
+
+
+@pytest.mark.unit
+def test_optimize_dtypes_inferred():
+    df = pd.DataFrame(
+        {
+            "small_int": pd.Series([1, 2, None], dtype=object),
+            "big_int": [2**40, 1, 2],
+            "huge_int": [2**70, 1, 2],
+            "amount": [decimal.Decimal("1.5"), None, decimal.Decimal("2")],
+            "status": ["open", "open", "open"],
+            "name": ["Juan", "David", "Herrera"],
+            "created_at": [datetime.datetime(2024, 1, 1), None, datetime.datetime(2024, 1, 2)],
+            "flag": [True, False, None],
+        }
+    )
+
+    result = optimize_dtypes(df)
+
+    assert result["small_int"].dtype == "Int8"
+    assert result["big_int"].dtype == "Int64"
+    assert result["huge_int"].dtype == object
+    assert result["amount"].dropna().tolist() == [decimal.Decimal("1.5"), decimal.Decimal("2")]
+    assert isinstance(result["amount"].dtype, pd.ArrowDtype)
+    assert result["status"].dtype == "category"
+    assert pd.api.types.is_string_dtype(result["name"])
+    assert result["created_at"].dtype == "datetime64[ns]"
+    assert result["flag"].dtype == "boolean"
+    assert result["small_int"].isna().tolist() == [False, False, True]
+
+
+@pytest.mark.unit
+def test_optimize_dtypes_with_column_types():
+    df = pd.DataFrame({"id": [1.0, None, 300.0], "code": ["1", "2", "3"]})
+
+    result = optimize_dtypes(df, {"id": ColumnType("integer", 4, 0), "code": ColumnType("other")})
+
+    assert result["id"].dtype == "Int16"
+    assert result["code"].dtype == object
+
+
+@pytest.mark.unit
+def test_optimize_dtypes_is_exact():
+    df = frame_from_rows(
+        [(2**53 + 1, decimal.Decimal("12345678901234567.89"), 1), (None, None, 2), (3, None, None)],
+        ["id", "amount", "small"],
+    )
+
+    result = optimize_dtypes(
+        df,
+        {
+            "id": ColumnType("integer", 18, 0),
+            "amount": ColumnType("decimal", 38, 2),
+            "small": ColumnType("integer", 38, 0),
+        },
+    )
+
+    assert result["id"].dtype == "Int64"
+    assert result["id"].tolist() == [2**53 + 1, pd.NA, 3]
+    assert result["amount"][0] == decimal.Decimal("12345678901234567.89")
+    assert result["amount"].isna().tolist() == [False, True, True]
+    # The precision, not the values, picks the width, so every batch gets the same dtype
+    assert result["small"].dtype == "Int64"
+
+
+@pytest.mark.unit
+def test_pin_text_dtypes():
+    column_types = {"status": ColumnType("text"), "id": ColumnType("integer", 9, 0)}
+    first = optimize_dtypes(pd.DataFrame({"status": ["a", "a"], "id": [1, 2]}), column_types)
+    pinned = pin_text_dtypes(first, column_types)
+
+    second = optimize_dtypes(pd.DataFrame({"status": ["b"], "id": [3]}), pinned)
+
+    assert pinned["status"].kind == "category"
+    assert first["status"].dtype == "category" and second["status"].dtype == "category"
+    assert first["id"].dtype == second["id"].dtype == "Int32"
+
+
+@pytest.mark.unit
+def test_infer_column_types():
+    df = frame_from_rows([(1, "a", 1.5, None)], ["id", "name", "price", "empty"])
+
+    assert infer_column_types(df) == {
+        "id": ColumnType("integer"),
+        "name": ColumnType("text"),
+        "price": ColumnType("float"),
+        "empty": ColumnType("other"),
+    }
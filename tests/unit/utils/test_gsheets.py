@@ -0,0 +1,181 @@
+import json
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from jds_tools.utils.gsheets import (
+    adapt_data_for_gsheets,
+    frame_to_grid,
+    grid_to_frame,
+    iter_frame_blocks,
+    iter_frame_grid,
+    render_options,
+    split_blocks,
+)
+
+
+@pytest.fixture
+def data():
+    return pd.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "amount": [1.5, np.nan, np.inf],
+            "nullable": pd.array([1, None, 3], dtype="Int64"),
+            "flag": [True, False, True],
+            "created": pd.to_datetime(["2024-01-02 03:04:05", None, "2024-01-03 00:00:00"]),
+            "day": pd.to_datetime(["2024-01-02", "2024-01-03", None]).tz_localize("UTC"),
+            "price": [Decimal("1.25"), None, Decimal("3")],
+            "name": ["a", None, "c"],
+            "group": pd.Categorical(["x", "y", None]),
+        },
+        index=pd.Index([10, 20, 30], name="key"),
+    )
+
+
+@pytest.mark.unit
+def test_frame_to_grid(data):
+    grid = frame_to_grid(data)
+
+    assert grid == [
+        ["id", "amount", "nullable", "flag", "created", "day", "price", "name", "group"],
+        [1, 1.5, 1, True, "2024-01-02 03:04:05", "2024-01-02", 1.25, "a", "x"],
+        [2, "", "", False, "", "2024-01-03", "", "", "y"],
+        [3, "", 3, True, "2024-01-03 00:00:00", "", 3.0, "c", ""],
+    ]
+    json.dumps(grid)
+
+
+@pytest.mark.unit
+def test_frame_to_grid_index_without_headers(data):
+    grid = frame_to_grid(data[["id"]], include_headers=False, include_index=True)
+    assert grid == [[10, 1], [20, 2], [30, 3]]
+
+    grid = frame_to_grid(data[["id"]], include_index=True)
+    assert grid[0] == ["key", "id"]
+
+
+@pytest.mark.unit
+def test_frame_to_grid_empty():
+    assert frame_to_grid(pd.DataFrame(columns=["a", "b"])) == [["a", "b"]]
+    assert frame_to_grid(pd.DataFrame(index=range(2)), include_headers=False) == [[], []]
+
+
+@pytest.mark.unit
+def test_iter_frame_grid(data):
+    blocks = list(iter_frame_grid(data[["id", "name"]], rows_per_block=2))
+    assert blocks == [[["id", "name"], [1, "a"]], [[2, ""], [3, "c"]]]
+
+    blocks = list(iter_frame_grid(data[["id"]], rows_per_block=2, include_headers=False))
+    assert blocks == [[[1], [2]], [[3]]]
+    with pytest.raises(ValueError):
+        next(iter_frame_grid(data, rows_per_block=0))
+
+
+@pytest.mark.unit
+def test_iter_frame_blocks_match_split_blocks():
+    df = pd.DataFrame({"a": range(10), "b": range(10)})
+
+    blocks = list(iter_frame_blocks(df, "B3:C20", chunk_cells=8))
+
+    assert blocks == split_blocks(frame_to_grid(df), "B3:C20", 8)
+    assert [block_range for block_range, _ in blocks] == ["B3", "B7", "B11"]
+
+
+@pytest.fixture
+def values():
+    return [
+        ["id", "price", "active", "day", "name", "empty"],
+        ["1", "1.5", "TRUE", "2024-01-02", "a", ""],
+        ["2", "", "FALSE", "2024-01-03", "b", ""],
+        ["3", "2", "TRUE", "", "1", ""],
+    ]
+
+
+@pytest.mark.unit
+def test_grid_to_frame_untyped(values):
+    df = grid_to_frame(values)
+    assert (df.dtypes == object).all()
+    assert df["price"].tolist() == ["1.5", "", "2"]
+
+
+@pytest.mark.unit
+def test_grid_to_frame_infer_dtypes(values):
+    df = grid_to_frame(values, infer_dtypes=True)
+
+    assert df.dtypes.to_dict() == {
+        "id": "Int64",
+        "price": "float64",
+        "active": "boolean",
+        "day": "datetime64[ns]",
+        "name": object,
+        "empty": object,
+    }
+    assert df["price"].isna().tolist() == [False, True, False]
+    assert df["day"].isna().tolist() == [False, False, True]
+    assert df["name"].tolist() == ["a", "b", "1"]
+
+
+@pytest.mark.unit
+def test_grid_to_frame_unformatted_values():
+    df = grid_to_frame([["a", "b", "c"], [1, True, 0.5], [0, False, 2]], infer_dtypes=True)
+    assert df.dtypes.to_dict() == {"a": "Int64", "b": "boolean", "c": "float64"}
+
+
+@pytest.mark.unit
+def test_grid_to_frame_dtypes(values):
+    df = grid_to_frame(values, dtypes={"id": "int32", "day": "datetime64[ns]", "price": float})
+
+    assert df.dtypes.to_dict() == {
+        "id": "int32",
+        "price": "float64",
+        "active": object,
+        "day": "datetime64[ns]",
+        "name": object,
+        "empty": object,
+    }
+    with pytest.raises(ValueError):
+        grid_to_frame(values, dtypes={"name": "boolean"})
+
+
+@pytest.mark.unit
+def test_grid_to_frame_ragged_rows():
+    df = grid_to_frame([["a", "b"], ["1"], ["2", "x", "extra"]], infer_dtypes=True)
+    assert df.columns.tolist() == ["a", "b"]
+    assert df["a"].tolist() == [1, 2]
+    assert df["b"].isna().tolist() == [True, False]
+
+
+@pytest.mark.unit
+def test_adapt_data_for_gsheets():
+    rows = [["a", "b"], [1, 2]]
+    assert adapt_data_for_gsheets(rows) is rows
+    assert adapt_data_for_gsheets(pd.Series({"a": 1, "b": 2}), include_headers=False) == [[1, 2]]
+
+
+@pytest.mark.unit
+def test_render_options():
+    assert render_options(None) == {}
+    assert {key: option.value for key, option in render_options("FORMULA").items()} == {
+        "valueRenderOption": "FORMULA",
+        "dateTimeRenderOption": "FORMATTED_STRING",
+    }
+    assert list(render_options("FORMATTED_VALUE")) == ["valueRenderOption"]
+
+
+@pytest.mark.unit
+def test_split_blocks():
+    values = [[i, i] for i in range(5)]
+    assert split_blocks(values, "B2", None) == [("B2", values)]
+    assert split_blocks(values, "B2:C6", 4) == [
+        ("B2", values[0:2]),
+        ("B4", values[2:4]),
+        ("B6", values[4:5]),
+    ]
+
+
+@pytest.mark.unit
+def test_grid_to_frame_keeps_whole_floats():
+    df = grid_to_frame([["a", "b", "c"], ["1.0", 2.0, "3"], ["2", 4.0, "-4"]], infer_dtypes=True)
+    assert df.dtypes.to_dict() == {"a": "float64", "b": "float64", "c": "Int64"}
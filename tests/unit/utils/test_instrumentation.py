@@ -0,0 +1,76 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from jds_tools.utils.instrumentation import InMemoryCollector, Instrumentation, QuerySpan
+
+
+@pytest.mark.unit
+def test_span_records_phases_and_dispatches():
+    collector = InMemoryCollector()
+    instrumentation = Instrumentation(collector)
+
+    with instrumentation.span("fetch", "SELECT 1", warehouse="wh") as span:
+        with span.phase("execute"):
+            pass
+        with span.phase("fetch"):
+            pass
+        with span.phase("fetch"):
+            pass
+        span.rows = 1
+
+    [recorded] = collector.spans
+    assert recorded is span
+    assert recorded.warehouse == "wh"
+    assert recorded.rows == 1
+    assert set(recorded.phases) == {"execute", "fetch"}
+    assert recorded.duration >= sum(recorded.phases.values())
+    assert recorded.error is None
+
+
+@pytest.mark.unit
+def test_span_records_errors():
+    collector = InMemoryCollector()
+    instrumentation = Instrumentation(collector)
+
+    with pytest.raises(ValueError):
+        with instrumentation.span("execute", "SELECT 1"):
+            raise ValueError("boom")
+
+    assert collector.spans[0].error == "ValueError('boom')"
+    assert collector.spans[0].duration is not None
+
+
+@pytest.mark.unit
+def test_callback_errors_do_not_interrupt():
+    collector = InMemoryCollector()
+    instrumentation = Instrumentation(MagicMock(side_effect=RuntimeError("boom")), collector)
+
+    with instrumentation.span("execute", "SELECT 1"):
+        pass
+
+    assert len(collector.spans) == 1
+
+
+@pytest.mark.unit
+def test_collector_summary():
+    collector = InMemoryCollector(max_spans=100)
+    for duration in range(1, 101):
+        collector(QuerySpan("fetch", "SELECT 1", rows=1, duration=float(duration)))
+    collector(QuerySpan("execute", "DROP TABLE a", duration=1.0, error="boom"))
+
+    summary = collector.summary()
+
+    assert len(collector.spans) == 100
+    assert set(summary.index) == {"fetch", "execute"}
+    assert summary.loc["fetch", "count"] == 99
+    assert summary.loc["fetch", "rows"] == 99
+    assert summary.loc["execute", "errors"] == 1
+    assert summary.loc["fetch", "p50"] == 51.0
+    assert summary.loc["fetch", "p95"] == pytest.approx(95.1)
+    assert summary.loc["fetch", "max"] == 100.0
+
+
+@pytest.mark.unit
+def test_collector_summary_empty():
+    assert InMemoryCollector().summary().empty
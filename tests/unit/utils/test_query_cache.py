@@ -0,0 +1,93 @@
+import os
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from jds_tools.utils.query_cache import QueryCache
+
+
+@pytest.fixture
+def data():
+    return pd.DataFrame({"id": [1, 2], "name": ["Juan", "David"]})
+
+
+@pytest.mark.unit
+def test_make_key_depends_on_queries_and_context():
+    key = QueryCache.make_key(["SELECT 1;"], {"database": "db"})
+    assert key == QueryCache.make_key(["SELECT 1;"], {"database": "db"})
+    assert key != QueryCache.make_key(["SELECT 2;"], {"database": "db"})
+    assert key != QueryCache.make_key(["SELECT 1;"], {"database": "other_db"})
+
+
+@pytest.mark.unit
+def test_memory_lru_eviction(data):
+    cache = QueryCache(max_entries=2)
+    cache.set("a", data)
+    cache.set("b", data)
+    cache.get("a")
+    cache.set("c", data)
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+@pytest.mark.unit
+def test_ttl_expiration(data):
+    cache = QueryCache(ttl=10)
+    with patch("jds_tools.utils.query_cache.time.time", return_value=1000):
+        cache.set("a", data)
+    with patch("jds_tools.utils.query_cache.time.time", return_value=1005):
+        assert cache.get("a") is not None
+    with patch("jds_tools.utils.query_cache.time.time", return_value=1011):
+        assert cache.get("a") is None
+
+
+@pytest.mark.unit
+def test_get_returns_copy(data):
+    cache = QueryCache()
+    cache.set("a", data)
+    cache.get("a").loc[0, "name"] = "changed"
+    pd.testing.assert_frame_equal(cache.get("a"), data)
+
+
+@pytest.mark.unit
+def test_disk_tier_and_invalidation(tmp_path, data):
+    pytest.importorskip("pyarrow")
+    cache = QueryCache(cache_dir=str(tmp_path))
+    cache.set("a", data)
+    assert os.path.exists(tmp_path / "a.parquet")
+
+    # A new cache instance (e.g. a new process) reads the persisted result
+    other_cache = QueryCache(cache_dir=str(tmp_path))
+    pd.testing.assert_frame_equal(other_cache.get("a"), data)
+
+    other_cache.invalidate()
+    assert other_cache.get("a") is None
+    assert not os.path.exists(tmp_path / "a.parquet")
+
+
+@pytest.mark.unit
+def test_disk_size_eviction(tmp_path, data):
+    pytest.importorskip("pyarrow")
+    cache = QueryCache(cache_dir=str(tmp_path), max_disk_bytes=1)
+    cache.set("a", data)
+    assert not os.path.exists(tmp_path / "a.parquet")
+
+
+@pytest.mark.unit
+def test_invalidate_drops_every_variant(data, tmp_path):
+    cache = QueryCache(cache_dir=str(tmp_path))
+    key = QueryCache.make_key(["SELECT 1;"])
+    variant = QueryCache.make_key(["SELECT 1;"], options={"engine": "arrow"})
+    other = QueryCache.make_key(["SELECT 2;"], options={"engine": "arrow"})
+    for k in (key, variant, other):
+        cache.set(k, data)
+
+    cache.invalidate(key)
+    cache._memory.clear()
+
+    assert cache.get(key) is None
+    assert cache.get(variant) is None
+    assert cache.get(other) is not None
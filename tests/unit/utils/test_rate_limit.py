@@ -0,0 +1,94 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from jds_tools.utils.rate_limit import RateLimiter, TokenBucket
+
+
+class TransientError(Exception):
+    pass
+
+
+@pytest.mark.unit
+def test_token_bucket_reservations_queue_in_order():
+    with patch("jds_tools.utils.rate_limit.time.monotonic", return_value=100.0):
+        bucket = TokenBucket(rate=2, capacity=2)
+        waits = [bucket.reserve() for _ in range(4)]
+
+    assert waits == [0, 0, 0.5, 1.0]
+
+
+@pytest.mark.unit
+def test_token_bucket_drain():
+    with patch("jds_tools.utils.rate_limit.time.monotonic", return_value=100.0):
+        bucket = TokenBucket(rate=1, capacity=5)
+        bucket.drain()
+        assert bucket.reserve() == 1.0
+
+
+@pytest.mark.unit
+def test_token_bucket_invalid_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+@pytest.mark.unit
+def test_shared_limiter_by_key():
+    first = RateLimiter.shared(("test", "a"), {"read": 60})
+    assert RateLimiter.shared(("test", "a"), {"read": 1}) is first
+    assert RateLimiter.shared(("test", "b"), {"read": 60}) is not first
+
+
+@pytest.mark.unit
+def test_call_retries_transient_errors():
+    limiter = RateLimiter(
+        {"write": 60000}, retry_on=lambda e: isinstance(e, TransientError), max_retries=2
+    )
+    function = MagicMock(side_effect=[TransientError(), TransientError(), "done"])
+
+    with patch("jds_tools.utils.rate_limit.time.sleep") as sleep_mock:
+        assert limiter.call("write", function, 1, key="value") == "done"
+
+    assert function.call_count == 3
+    function.assert_called_with(1, key="value")
+    assert sleep_mock.call_count >= 2
+
+
+@pytest.mark.unit
+def test_call_gives_up():
+    limiter = RateLimiter({"write": 60000}, retry_on=lambda e: isinstance(e, TransientError))
+    function = MagicMock(side_effect=TransientError())
+    with patch("jds_tools.utils.rate_limit.time.sleep"):
+        with pytest.raises(TransientError):
+            limiter.call("write", function, max_retries=1)
+    assert function.call_count == 2
+
+    function = MagicMock(side_effect=ValueError())
+    with pytest.raises(ValueError):
+        limiter.call("write", function)
+    assert function.call_count == 1
+
+
+@pytest.mark.unit
+def test_backoff_is_capped():
+    limiter = RateLimiter({"read": 60}, base_delay=1, max_delay=4)
+    assert all(0 <= limiter.backoff(attempt) <= 4 for attempt in range(10))
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_acall_retries_transient_errors():
+    limiter = RateLimiter({"read": 60000}, retry_on=lambda e: isinstance(e, TransientError))
+    attempts = []
+
+    async def function(value):
+        attempts.append(value)
+        if len(attempts) == 1:
+            raise TransientError()
+        return value * 2
+
+    with patch("jds_tools.utils.rate_limit.asyncio.sleep", new_callable=AsyncMock) as sleep_mock:
+        assert await limiter.acall("read", function, 21) == 42
+
+    assert attempts == [21, 21]
+    sleep_mock.assert_awaited()
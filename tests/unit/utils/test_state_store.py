@@ -0,0 +1,34 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from jds_tools.utils.state_store import JsonStateStore, SQLiteStateStore, to_json_value
+
+
+@pytest.mark.unit
+def test_to_json_value():
+    assert to_json_value(pd.Timestamp("2024-01-01 10:00")) == "2024-01-01T10:00:00"
+    assert to_json_value(datetime.date(2024, 1, 1)) == "2024-01-01"
+    assert to_json_value(np.int64(5)) == 5
+    assert to_json_value(float("nan")) is None
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("store_class", [JsonStateStore, SQLiteStateStore])
+def test_state_store_roundtrip(tmp_path, store_class):
+    path = str(tmp_path / "state.db")
+    store = store_class(path)
+    assert store.get("orders", "default") == "default"
+
+    store.set("orders", pd.Timestamp("2024-01-01"))
+    store.set("events", np.int64(42))
+
+    # State survives new store instances
+    other_store = store_class(path)
+    assert other_store.get("orders") == "2024-01-01T00:00:00"
+    assert other_store.get("events") == 42
+
+    other_store.delete("orders")
+    assert other_store.get("orders") is None